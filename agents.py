@@ -66,7 +66,8 @@ def initialize_agents(tools_dict: dict, client_profile: dict):
         ),
         verbose=True,
         allow_delegation=False, # Keep focused
-        tools=[tools_dict['web_search'], tools_dict['generic_scraper']],
+        # The batch scraper (only provided when EXTRACTION_BATCH_SIZE > 1) lets one extraction task cover several URLs
+        tools=[tools_dict['web_search'], tools_dict['generic_scraper']] + ([tools_dict['batch_generic_scraper']] if tools_dict.get('batch_generic_scraper') else []),
         llm=agent_llm,
         max_iter=Config.RESEARCH_AGENT_MAX_ITER
     )
@@ -107,7 +108,8 @@ def initialize_agents(tools_dict: dict, client_profile: dict):
             ),
             verbose=True,
             allow_delegation=False,
-            tools=[tools_dict['email_finder'], tools_dict['pain_point_analyzer']],
+            # One combined tool call; the email lookup and pain point analysis run concurrently inside it
+            tools=[tools_dict['parallel_analyzer']],
             llm=agent_llm,
             max_iter=Config.ANALYSIS_AGENT_MAX_ITER
         )
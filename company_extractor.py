@@ -3,12 +3,14 @@ import logging
 import ast
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from crewai import Crew, Process, CrewOutput, Agent, Task
 from config import Config # For GENERIC_COMPANY_NAMES
 # Import task creators from tasks.py
 from tasks import create_analysis_task, create_review_task
 # Use the more robust parser from utils.parser for consistency
 from utils.parser import parse_company_data as parse_company_website_list
+from utils.parser import parse_company_data_by_source
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +24,7 @@ def parse_analysis_results(result: str) -> dict:
     logger.debug("Parsing analysis results...")
 
     if not isinstance(result, str):
-        logger.warning(f"Analysis result is not a string: {type(result)}. Cannot parse.")
+        logger.warning("Analysis result is not a string: %s. Cannot parse.", type(result))
         return {"email": "", "pain_points": "Analysis failed - non-string result"}
 
     # Standardize by removing potential "FINAL ANSWER:" prefix
@@ -57,7 +59,7 @@ def parse_analysis_results(result: str) -> dict:
 
     if valid_emails:
         email = valid_emails[0]  # Take the first plausible one
-        logger.debug(f"Extracted email: {email}")
+        logger.debug("Extracted email: %s", email)
     else:
         logger.debug("No valid email found in analysis results.")
 
@@ -76,7 +78,7 @@ def parse_analysis_results(result: str) -> dict:
         if match:
             extracted_block = match.group(1).strip()
             if len(extracted_block) > 20: # Ensure it's a substantial block
-                logger.debug(f"Found pain points block using pattern: {pattern}")
+                logger.debug("Found pain points block using pattern: %s", pattern)
                 break # Use the first successful match
     
     if extracted_block:
@@ -108,7 +110,8 @@ def parse_analysis_results(result: str) -> dict:
         pain_points_str = "No specific pain points identified in the output."
         logger.debug("Pain points string was empty or just the email after cleaning.")
 
-    logger.debug(f"Final parsed pain points (first 100 chars): {pain_points_str[:100]}...")
+    if logger.isEnabledFor(logging.DEBUG): # Skip the preview slice when DEBUG is off
+        logger.debug("Final parsed pain points (first 100 chars): %s...", pain_points_str[:100])
     return {"email": email, "pain_points": pain_points_str}
 
 
@@ -121,10 +124,10 @@ def extract_companies_from_url(url: str, agents: dict, extraction_task: Task) ->
     research_agent = agents.get('research')
 
     if not research_agent or not isinstance(research_agent, Agent):
-        logger.error(f"Research agent not found or invalid for URL extraction: {url}")
+        logger.error("Research agent not found or invalid for URL extraction: %s", url)
         return []
     if not extraction_task or not isinstance(extraction_task, Task):
-        logger.error(f"Invalid extraction_task provided for URL: {url}")
+        logger.error("Invalid extraction_task provided for URL: %s", url)
         return []
 
     try:
@@ -134,9 +137,9 @@ def extract_companies_from_url(url: str, agents: dict, extraction_task: Task) ->
             process=Process.sequential,
             verbose=False # Set to True for debugging CrewAI steps
         )
-        logger.debug(f"  Kicking off extraction crew for URL: {url}...")
+        logger.debug("  Kicking off extraction crew for URL: %s...", url)
         extraction_result_object = extraction_crew.kickoff()
-        logger.debug(f"  Extraction crew finished for {url}.")
+        logger.debug("  Extraction crew finished for %s.", url)
 
         raw_output = None
         if isinstance(extraction_result_object, CrewOutput):
@@ -148,18 +151,81 @@ def extract_companies_from_url(url: str, agents: dict, extraction_task: Task) ->
             # Using the robust parser from utils.parser
             extracted_company_data = parse_company_website_list(raw_output)
             if extracted_company_data:
-                logger.info(f"  Extracted {len(extracted_company_data)} company/website pairs from {url}.")
+                logger.info("  Extracted %s company/website pairs from %s.", len(extracted_company_data), url)
             else:
-                logger.info(f"  Parsing company list returned no results for {url} (Raw: {raw_output[:100]}...).")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("  Parsing company list returned no results for %s (Raw: %s...).", url, raw_output[:100])
         else:
-            logger.warning(f"  Extraction crew returned no parsable output for {url}.")
+            logger.warning("  Extraction crew returned no parsable output for %s.", url)
 
     except Exception as e:
-        logger.error(f"  Error during company extraction process for '{url}': {e}", exc_info=True)
+        logger.error("  Error during company extraction process for '%s': %s", url, e, exc_info=True)
 
     return extracted_company_data
 
 
+def _source_match_key(url: str) -> str:
+    """URL without scheme, www. or trailing slash, lowercased; how batch sources are matched to the URLs given."""
+    bare = url.strip().lower().split('://', 1)[-1]
+    if bare.startswith('www.'):
+        bare = bare[4:]
+    return bare.rstrip('/')
+
+
+def extract_companies_from_urls(urls: list, agents: dict, extraction_task: Task) -> dict:
+    """
+    Extract company information from several URLs with one batch extraction task.
+
+    Returns a dict of source URL -> list of company dicts, keyed by the URLs given. Companies filed
+    under a source that matches none of them keep the source the agent reported.
+    """
+    companies_by_url = {}
+    research_agent = agents.get('research')
+
+    if not research_agent or not isinstance(research_agent, Agent):
+        logger.error("Research agent not found or invalid for batch URL extraction.")
+        return {}
+    if not extraction_task or not isinstance(extraction_task, Task):
+        logger.error("Invalid batch extraction_task provided for %s URLs.", len(urls))
+        return {}
+
+    try:
+        extraction_crew = Crew(
+            agents=[research_agent],
+            tasks=[extraction_task],
+            process=Process.sequential,
+            verbose=False
+        )
+        logger.debug("  Kicking off batch extraction crew for %s URLs...", len(urls))
+        extraction_result_object = extraction_crew.kickoff()
+        logger.debug("  Batch extraction crew finished for %s URLs.", len(urls))
+
+        raw_output = None
+        if isinstance(extraction_result_object, CrewOutput):
+            raw_output = extraction_result_object.raw
+        elif isinstance(extraction_result_object, str):
+            raw_output = extraction_result_object
+
+        if raw_output:
+            # The agent may echo a URL with another scheme, www. or trailing slash; match on the bare form
+            batch_urls = {_source_match_key(url): url for url in urls}
+            for source, companies in parse_company_data_by_source(raw_output).items():
+                if companies:
+                    source_url = batch_urls.get(_source_match_key(source))
+                    if source_url is None:
+                        logger.warning("  %s companies listed under unknown source '%s'; keeping it as their source URL.", len(companies), source)
+                        source_url = source
+                    companies_by_url.setdefault(source_url, []).extend(companies)
+            logger.info("  Extracted %s company/website pairs from %s URLs.", sum(map(len, companies_by_url.values())), len(urls))
+        else:
+            logger.warning("  Batch extraction crew returned no parsable output for %s URLs.", len(urls))
+
+    except Exception as e:
+        logger.error("  Error during batch company extraction for %s URLs: %s", len(urls), e, exc_info=True)
+
+    return companies_by_url
+
+
 def analyze_company(company_name: str, company_website: str, agents: dict, segment_config: dict, client_profile: dict):
     """
     Analyze a company to find email and pain points, including a review cycle,
@@ -196,17 +262,17 @@ def analyze_company(company_name: str, company_website: str, agents: dict, segme
     reviewer_agent = agents.get(reviewer_agent_key)
 
     if not analysis_agent or not isinstance(analysis_agent, Agent):
-        logger.error(f"  '{analyzer_agent_key}' not found or invalid for company '{company_name}'. Skipping analysis.")
+        logger.error("  '%s' not found or invalid for company '%s'. Skipping analysis.", analyzer_agent_key, company_name)
         final_company_data["pain_points"] = f"Analysis skipped - {analyzer_agent_key} agent missing"
         return final_company_data
 
     # Reviewer agent is optional for the analysis part to proceed
     if not reviewer_agent or not isinstance(reviewer_agent, Agent):
-        logger.warning(f"  '{reviewer_agent_key}' not found or invalid for '{company_name}'. Review cycle will be skipped.")
+        logger.warning("  '%s' not found or invalid for '%s'. Review cycle will be skipped.", reviewer_agent_key, company_name)
 
     try:
         # === Stage 1: Initial Analysis ===
-        logger.info(f"      >>> Starting analysis for '{company_name}' (Segment: {segment_name}) using {analyzer_agent_key}...")
+        logger.info("      >>> Starting analysis for '%s' (Segment: %s) using %s...", company_name, segment_name, analyzer_agent_key)
 
         # Create analysis_task using the selected agent and full context
         analysis_task = create_analysis_task(
@@ -218,7 +284,7 @@ def analyze_company(company_name: str, company_website: str, agents: dict, segme
         )
 
         if analysis_task is None:
-            logger.error(f"      Failed to create analysis task for '{company_name}'. Skipping analysis.")
+            logger.error("      Failed to create analysis task for '%s'. Skipping analysis.", company_name)
             final_company_data["pain_points"] = "Analysis failed - Task creation error"
             return final_company_data
 
@@ -230,7 +296,7 @@ def analyze_company(company_name: str, company_website: str, agents: dict, segme
             verbose=False # Set to True for debugging CrewAI steps
         )
         analysis_result_object = analysis_crew.kickoff()
-        logger.debug(f"      <<< Initial analysis finished for '{company_name}'.")
+        logger.debug("      <<< Initial analysis finished for '%s'.", company_name)
 
         # Parse initial results
         initial_email = ""
@@ -246,9 +312,10 @@ def analyze_company(company_name: str, company_website: str, agents: dict, segme
             parsed_initial = parse_analysis_results(raw_output)
             initial_email = parsed_initial.get('email', '')
             initial_pain_points = parsed_initial.get('pain_points', 'Initial analysis parsing failed')
-            logger.debug(f"      Parsed initial analysis - Email: '{initial_email}', Points: '{initial_pain_points[:100]}...'")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("      Parsed initial analysis - Email: '%s', Points: '%s...'", initial_email, initial_pain_points[:100])
         else:
-            logger.warning(f"      Initial analysis for {company_name} returned output, but raw string could not be extracted.")
+            logger.warning("      Initial analysis for %s returned output, but raw string could not be extracted.", company_name)
             initial_pain_points = "Initial analysis failed: Could not extract raw output."
 
         final_company_data["contact_email"] = initial_email
@@ -256,22 +323,27 @@ def analyze_company(company_name: str, company_website: str, agents: dict, segme
 
         # === Stage 2: Review Cycle ===
         if not reviewer_agent: # Check if reviewer agent is valid before proceeding
-            logger.warning(f"      Skipping review cycle for '{company_name}' because reviewer agent ('{reviewer_agent_key}') is missing.")
+            logger.warning("      Skipping review cycle for '%s' because reviewer agent ('%s') is missing.", company_name, reviewer_agent_key)
         elif not initial_pain_points or initial_pain_points.startswith("Initial analysis failed") or initial_pain_points.startswith("Analysis failed") or initial_pain_points.startswith("Analysis skipped"):
-            logger.warning(f"      Skipping review cycle for '{company_name}' due to initial analysis failure or lack of valid points.")
+            logger.warning("      Skipping review cycle for '%s' due to initial analysis failure or lack of valid points.", company_name)
         else:
-            logger.info(f"      >>> Starting pain point review for '{company_name}' (Segment: {segment_name}) using {reviewer_agent_key}...")
-            review_task = create_review_task(
-                company_name,
-                company_website,
-                initial_pain_points,
-                reviewer_agent, # Pass the specific reviewer agent
-                segment_config,
-                client_profile
-            )
+            logger.info("      >>> Starting pain point review for '%s' (Segment: %s) using %s...", company_name, segment_name, reviewer_agent_key)
+            try:
+                review_task = create_review_task(
+                    company_name,
+                    company_website,
+                    initial_pain_points,
+                    reviewer_agent, # Pass the specific reviewer agent
+                    segment_config,
+                    client_profile
+                )
+            except Exception as review_task_err:
+                # Keep the initial points rather than failing the whole analysis
+                logger.error("      Error creating review task for '%s': %s", company_name, review_task_err, exc_info=True)
+                review_task = None
 
             if review_task is None:
-                logger.error(f"      Failed to create review task for '{company_name}'. Skipping review.")
+                logger.error("      Failed to create review task for '%s'. Skipping review.", company_name)
             else:
                 try:
                     # Reviewer agent executes its task directly (not in a new Crew for a single task)
@@ -286,7 +358,7 @@ def analyze_company(company_name: str, company_website: str, agents: dict, segme
                         verbose=False
                     )
                     review_result_object = review_crew.kickoff()
-                    logger.debug(f"      <<< Review cycle finished for '{company_name}'.")
+                    logger.debug("      <<< Review cycle finished for '%s'.", company_name)
 
                     review_raw_output = None
                     if isinstance(review_result_object, CrewOutput):
@@ -300,26 +372,83 @@ def analyze_company(company_name: str, company_website: str, agents: dict, segme
 
                         if reviewed_pain_points and not reviewed_pain_points.startswith("Analysis failed") and reviewed_pain_points != initial_pain_points:
                             if len(reviewed_pain_points) > 10 and reviewed_pain_points != "No specific pain points identified in the output.": # Ensure meaningful review
-                                logger.info(f"      Review cycle provided refined pain points for '{company_name}'.")
+                                logger.info("      Review cycle provided refined pain points for '%s'.", company_name)
                                 final_company_data["pain_points"] = reviewed_pain_points
                             else:
-                                logger.info(f"      Review provided minimal/no content, keeping initial points for '{company_name}'.")
+                                logger.info("      Review provided minimal/no content, keeping initial points for '%s'.", company_name)
                         elif reviewed_pain_points == initial_pain_points:
-                            logger.info(f"      Review validated initial pain points for '{company_name}'.")
+                            logger.info("      Review validated initial pain points for '%s'.", company_name)
                         else:
-                            logger.warning(f"      Review output parsing failed or yielded no new points for {company_name}. Using initial points.")
+                            logger.warning("      Review output parsing failed or yielded no new points for %s. Using initial points.", company_name)
                     else:
-                        logger.warning(f"      Review task for {company_name} returned no parsable output. Using initial points.")
+                        logger.warning("      Review task for %s returned no parsable output. Using initial points.", company_name)
 
                 except Exception as review_err:
-                    logger.error(f"      Error during review task execution for '{company_name}': {review_err}", exc_info=True)
-                    logger.warning(f"      Using initial pain points for {company_name} due to review execution error.")
+                    logger.error("      Error during review task execution for '%s': %s", company_name, review_err, exc_info=True)
+                    logger.warning("      Using initial pain points for %s due to review execution error.", company_name)
         
         return final_company_data
 
     except Exception as e:
-        logger.error(f"      Overall error during company analysis process for '{company_name}' (Segment: {segment_name}): {e}", exc_info=True)
+        logger.error("      Overall error during company analysis process for '%s' (Segment: %s): %s", company_name, segment_name, e, exc_info=True)
         final_company_data["pain_points"] = f"Analysis failed (Segment: {segment_name}): Exception - {type(e).__name__}"
         if not final_company_data.get("contact_email"):
             final_company_data["contact_email"] = "" # Ensure email key exists
         return final_company_data
+
+
+def analyze_companies(companies: list, agents: dict, segment_config: dict, client_profile: dict, max_workers: int = 1, delay: float = 0.0):
+    """
+    Run analyze_company for several companies of one segment.
+
+    With max_workers > 1 the companies' analysis/review crews run concurrently on a thread pool
+    (they spend nearly all their time waiting on the LLM provider). Each worker gets its own copies
+    of the segment's analyzer and reviewer agents, since a CrewAI Agent keeps per-execution state.
+    With max_workers == 1 companies are analyzed one after another, pausing `delay` seconds after each;
+    in parallel, analyses are started `delay` seconds apart so LLM calls stay paced.
+
+    Args:
+        companies: List of (company_name, company_website) pairs
+        agents: Dictionary of ALL initialized agents.
+        segment_config: Configuration dictionary for the segment the companies belong to.
+        client_profile: Overall client profile dictionary.
+        max_workers: Upper bound on companies analyzed at the same time.
+        delay: Seconds to wait after each company (between submissions when running in parallel).
+
+    Yields:
+        (company_name, company_website, analysis data or None) tuples, in input order.
+    """
+    segment_name = segment_config.get("SEGMENT_NAME", "Unknown Segment")
+    parallel = max_workers > 1 and len(companies) > 1
+    segment_agent_keys = (f"{segment_name}_analyzer", f"{segment_name}_reviewer")
+
+    def analyze_one(company):
+        company_name, company_website = company
+        worker_agents = agents
+        if parallel:
+            worker_agents = dict(agents)
+            for key in segment_agent_keys:
+                if isinstance(agents.get(key), Agent):
+                    worker_agents[key] = agents[key].copy()
+        try:
+            return analyze_company(company_name, company_website, worker_agents, segment_config, client_profile)
+        except Exception as e:
+            # analyze_company handles its own errors; this only guards the pool from unexpected ones
+            logger.error("      Unexpected error analyzing '%s': %s", company_name, e, exc_info=True)
+            return None
+
+    if not parallel:
+        for company in companies:
+            yield (*company, analyze_one(company))
+            time.sleep(delay)
+        return
+
+    logger.info("      Analyzing %s companies with up to %s in parallel...", len(companies), max_workers)
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(companies))) as pool:
+        futures = []
+        for company in companies:
+            if futures:
+                time.sleep(delay) # Pace submissions like the sequential loop paces companies
+            futures.append(pool.submit(analyze_one, company))
+        for company, future in zip(companies, futures):
+            yield (*company, future.result())
@@ -26,37 +26,59 @@ Environment Variables:
     Optional variables can be found in the config.py file
 """
 
-import time
 import logging
-from dotenv import load_dotenv
+from urllib.parse import urlsplit
 
 # Import our custom modules
 from url_processor import perform_search
-from company_extractor import extract_companies_from_url, analyze_company
+from company_extractor import extract_companies_from_url, extract_companies_from_urls, analyze_companies
 from output_manager import write_to_csv
-# Import Config and the new SJ_MORSE_PROFILE
-from config import Config, SJ_MORSE_PROFILE
+# Import Config and the client profile accessors
+from config import Config, get_sj_morse_profile, get_segments
 # Import task creators
-from tasks import create_search_tasks, create_extraction_task
+from tasks import create_search_tasks, create_extraction_task, create_batch_extraction_task
 from utils.logging_utils import get_logger, ErrorCollection
 
 # Configure logging
 Config.configure_logging()
 logger = get_logger(__name__) # Ensure logger is fetched after configuration
 
-# Load environment variables
-load_dotenv()
+# Environment variables (.env) are loaded once by config on import
+
+# --- Run-invariant settings, computed once at startup ---
+# Optional short delay between analyzing companies from the same URL
+COMPANY_ANALYSIS_DELAY = Config.API_RETRY_DELAY / 2 if Config.API_RETRY_DELAY > 0 else 0.5
+# Placeholder pain_points values that mark an analysis as unsuccessful (used in the pre-CSV summary)
+_FAILED_ANALYSIS_MARKERS = frozenset({
+    "Initial analysis did not run",
+    "Analysis failed - non-string result",
+    "Analysis failed - Task creation error",
+    "Analysis failed to return data" # Our new placeholder
+})
+_FAILED_ANALYSIS_PREFIXES = ("Analysis skipped", "Analysis failed (")
+
+
+def company_website_key(company_website: str) -> str:
+    """
+    Return the key used to spot the same company listed twice in one run: its website's host + path
+    without scheme, "www.", query or trailing slash. "https://www.acme.com/" and "acme.com" match,
+    while different pages on a shared host (e.g. directory profiles) do not. Names are not compared,
+    since unrelated firms often share one (e.g. two "Summit Construction"s).
+    """
+    website = company_website.strip().lower()
+    parts = urlsplit(website if '//' in website else '//' + website)
+    host = parts.netloc[4:] if parts.netloc.startswith('www.') else parts.netloc
+    return host + parts.path.rstrip('/')
 
 # Import tools and initialize agents
 error_collector = ErrorCollection()
 try:
     # --- Tool Imports ---
-    from tools.scraper_tools import generic_scraper_tool
-    from tools.unified_email_finder import unified_email_finder_tool
-    from tools.llm_tools import analyze_pain_points_tool # This tool's internal prompt will need significant change
+    from tools.scraper_tools import generic_scraper_tool, batch_generic_scraper_tool, MAX_BATCH_SCRAPE_URLS
+    from tools.llm_tools import parallel_analysis_tool # Wraps the email finder and pain point analyzer tools
     from tools.search_tools import web_search_tool
     # --- Agent Initialization ---
-    # initialize_agents will be adapted to create agents based on SJ_MORSE_PROFILE segments
+    # initialize_agents will be adapted to create agents based on the client profile segments
     from agents import initialize_agents
 
     if web_search_tool is None:
@@ -73,13 +95,13 @@ try:
                            fatal=True)
 
     # Log API key presence for the configured LLM provider and Serper
-    logger.info(f"LLM_PROVIDER set to: {Config.LLM_PROVIDER}")
+    logger.info("LLM_PROVIDER set to: %s", Config.LLM_PROVIDER)
     if Config.LLM_PROVIDER == "openai":
-        logger.info(f"OPENAI_API_KEY presence: {'Yes' if Config.OPENAI_API_KEY else 'No'}")
+        logger.info("OPENAI_API_KEY presence: %s", 'Yes' if Config.OPENAI_API_KEY else 'No')
     elif Config.LLM_PROVIDER == "anthropic":
-        logger.info(f"ANTHROPIC_API_KEY presence: {'Yes' if Config.ANTHROPIC_API_KEY else 'No'}")
+        logger.info("ANTHROPIC_API_KEY presence: %s", 'Yes' if Config.ANTHROPIC_API_KEY else 'No')
     # Add more elif for other providers if you log their key presence specifically
-    logger.info(f"SERPER_API_KEY presence: {'Yes' if Config.SERPER_API_KEY else 'No'}")
+    logger.info("SERPER_API_KEY presence: %s", 'Yes' if Config.SERPER_API_KEY else 'No')
 
 except ImportError as e:
     error_collector.add("Module Import", e, fatal=True)
@@ -95,119 +117,143 @@ if error_collector.has_fatal_errors():
 tools = {
     'web_search': web_search_tool,
     'generic_scraper': generic_scraper_tool,
-    'email_finder': unified_email_finder_tool,
-    'pain_point_analyzer': analyze_pain_points_tool
+    'parallel_analyzer': parallel_analysis_tool # Email lookup + pain point analysis in one call
 }
+# Batch extraction is opt-in: the research agent only gets the batch scraper when it is enabled
+if Config.EXTRACTION_BATCH_SIZE > 1:
+    tools['batch_generic_scraper'] = batch_generic_scraper_tool
+
+def extract_companies_in_batches(urls: list, agents: dict, segment_name: str):
+    """
+    Yield (source_url, extracted company dicts) for each URL of a segment.
+
+    URLs are handed to the research agent Config.EXTRACTION_BATCH_SIZE at a time, each batch as a
+    single task with one batch scraper call; a batch size of 1 keeps the one-task-per-URL flow.
+    """
+    batch_size = max(1, min(Config.EXTRACTION_BATCH_SIZE, MAX_BATCH_SCRAPE_URLS))
+
+    if batch_size == 1:
+        for i, target_url in enumerate(urls):
+            logger.info("\n    Processing URL %s/%s for %s: %s", i+1, len(urls), segment_name, target_url)
+            # create_extraction_task uses the generic research agent.
+            logger.debug("      Creating extraction task for URL: %s...", target_url)
+            extraction_task = create_extraction_task(target_url, agents['research']) # Pass research agent
+            if not extraction_task:
+                logger.error("      Failed to create extraction task for %s. Skipping URL.", target_url)
+                continue
+            logger.debug("      Extracting companies from URL: %s...", target_url)
+            yield target_url, extract_companies_from_url(target_url, agents, extraction_task)
+        return
+
+    for start in range(0, len(urls), batch_size):
+        url_batch = urls[start:start + batch_size]
+        logger.info("\n    Processing URLs %s-%s/%s for %s", start+1, start+len(url_batch), len(urls), segment_name)
+        extraction_task = create_batch_extraction_task(url_batch, agents['research'])
+        if not extraction_task:
+            logger.error("      Failed to create batch extraction task for %s URLs. Skipping batch.", len(url_batch))
+            continue
+        companies_by_url = extract_companies_from_urls(url_batch, agents, extraction_task)
+        for target_url in url_batch:
+            yield target_url, companies_by_url.pop(target_url, [])
+        # Whatever is left was filed under a source the agent named that matches none of the batch URLs
+        yield from companies_by_url.items()
+
 
 # Main execution block
 if __name__ == "__main__":
-    logger.info(f"\n--- Starting Lead Generation Crew for Client: {SJ_MORSE_PROFILE['CLIENT_NAME']} ---")
+    client_profile = get_sj_morse_profile()
+    logger.info("\n--- Starting Lead Generation Crew for Client: %s ---", client_profile['CLIENT_NAME'])
 
     all_processed_companies = []
-    # Keep track of websites processed in this specific run to avoid re-analyzing
+    # Keep track of company websites (normalized, see company_website_key) processed in this specific run to avoid re-analyzing
     processed_websites_this_run = set()
+    extracted_count = duplicate_count = 0
 
     # Initialize agents
     # This function will be updated in agents.py to create agents tailored for SJ Morse segments
     try:
-        agents = initialize_agents(tools, SJ_MORSE_PROFILE) # Pass SJ_MORSE_PROFILE to agent initialization
-        logger.info(f"Agents initialized successfully. Available agents: {list(agents.keys())}")
+        agents = initialize_agents(tools, client_profile) # Pass the client profile to agent initialization
+        logger.info("Agents initialized successfully. Available agents: %s", list(agents.keys()))
         # TODO: Update agent key check once agents.py is refactored
         # e.g., expected_keys = {'research', 'gc_analyzer', 'gc_reviewer', 'architect_analyzer', 'architect_reviewer'}
         # if not expected_keys.issubset(agents.keys()):
         #     raise ValueError(f"Expected SJ Morse specific agents not found. Got: {list(agents.keys())}")
     except Exception as e:
         error_collector.add("Agent Initialization", e, fatal=True)
-        logger.error(f"Fatal error during agent initialization: {e}")
+        logger.error("Fatal error during agent initialization: %s", e)
         logger.error(error_collector.get_summary())
         exit(1)
 
-    # --- Loop through each target segment defined in SJ_MORSE_PROFILE ---
-    for segment_config in SJ_MORSE_PROFILE["TARGET_SEGMENTS"]:
+    # --- Loop through each target segment defined in the client profile ---
+    for segment_config in client_profile["TARGET_SEGMENTS"]:
         segment_name = segment_config["SEGMENT_NAME"]
-        logger.info(f"\n>>> Processing Segment: {segment_name} <<<")
+        logger.info("\n>>> Processing Segment: %s <<<", segment_name)
 
         # Step 1 (per segment): Find relevant URLs for this segment
         # create_search_tasks will be adapted in tasks.py to use segment_config
-        logger.info(f"  Creating search tasks for segment: {segment_name}...")
+        logger.info("  Creating search tasks for segment: %s...", segment_name)
         search_tasks = create_search_tasks(agents['research'], segment_config) # Pass research agent and segment_config
         
         if not search_tasks:
-            logger.error(f"  Failed to create search tasks for segment: {segment_name}. Skipping segment.")
+            logger.error("  Failed to create search tasks for segment: %s. Skipping segment.", segment_name)
             continue
             
-        logger.info(f"  Performing search for segment: {segment_name}...")
+        logger.info("  Performing search for segment: %s...", segment_name)
         url_list = perform_search(agents, search_tasks) # perform_search uses agents['research']
 
         if not url_list:
-            logger.warning(f"  No URLs found by Research Agent for segment: {segment_name}. Skipping to next segment.")
+            logger.warning("  No URLs found by Research Agent for segment: %s. Skipping to next segment.", segment_name)
             continue
 
-        logger.info(f"  Found {len(url_list)} URLs for {segment_name}. Processing up to {Config.MAX_URLS_TO_PROCESS} URLs.")
+        logger.info("  Found %s URLs for %s. Processing up to %s URLs.", len(url_list), segment_name, Config.MAX_URLS_TO_PROCESS)
         urls_to_process = url_list[:Config.MAX_URLS_TO_PROCESS]
 
-        for i, target_url in enumerate(urls_to_process):
-            logger.info(f"\n    Processing URL {i+1}/{len(urls_to_process)} for {segment_name}: {target_url}")
-
-            # Step 2a (per URL): Extract Companies
-            # create_extraction_task uses the generic research agent.
-            logger.debug(f"      Creating extraction task for URL: {target_url}...")
-            extraction_task = create_extraction_task(target_url, agents['research']) # Pass research agent
-            
-            if not extraction_task:
-                logger.error(f"      Failed to create extraction task for {target_url}. Skipping URL.")
-                continue
-
-            logger.debug(f"      Extracting companies from URL: {target_url}...")
-            # extract_companies_from_url uses the research agent and its extraction_task
-            extracted_company_data = extract_companies_from_url(target_url, agents, extraction_task)
-
-
+        # Step 2a (per batch of URLs): Extract Companies
+        for target_url, extracted_company_data in extract_companies_in_batches(urls_to_process, agents, segment_name):
             if not extracted_company_data:
-                logger.info(f"      No companies extracted from {target_url} for segment {segment_name}.")
+                logger.info("      No companies extracted from %s for segment %s.", target_url, segment_name)
                 continue
 
-            logger.info(f"      Found {len(extracted_company_data)} potential companies from {target_url}. Analyzing...")
+            logger.info("      Found %s potential companies from %s. Analyzing...", len(extracted_company_data), target_url)
+            companies_to_analyze = []
             for company_dict in extracted_company_data:
                 company_name = company_dict.get('name')
                 company_website = company_dict.get('website')
 
                 if not company_name or not company_website:
-                    logger.warning(f"        Skipping entry with missing name/website: {company_dict}")
+                    logger.warning("        Skipping entry with missing name/website: %s", company_dict)
                     continue
 
-                # Intra-Run Duplicate Check (website normalization)
-                normalized_website = company_website.strip().lower()
-                if normalized_website.startswith('www.'):
-                   normalized_website = normalized_website[4:]
-                if normalized_website.endswith('/'):
-                    normalized_website = normalized_website[:-1]
-
-                if normalized_website in processed_websites_this_run:
-                    logger.info(f"        Skipping already processed website in this run: '{company_name}' ({company_website})")
+                # Intra-Run Duplicate Check (normalized website)
+                extracted_count += 1
+                website_key = company_website_key(company_website)
+                if website_key in processed_websites_this_run:
+                    duplicate_count += 1
+                    logger.info("        Skipping company already processed in this run: '%s' (%s)", company_name, company_website)
                     continue
                 
                 # Skip generic names
                 if company_name.lower() in Config.GENERIC_COMPANY_NAMES:
-                    logger.info(f"        Skipping generic company name: '{company_name}'")
+                    logger.info("        Skipping generic company name: '%s'", company_name)
                     continue
 
-                processed_websites_this_run.add(normalized_website) # Add before analysis
-
-                logger.info(f"        Analyzing '{company_name}' ({company_website}) for segment: {segment_name}")
-
-                # Step 2b (per company): Analyze Company
-                # analyze_company will be adapted in company_extractor.py
-                # It will need the segment_config to select the correct analyzer/reviewer agents
-                # and to pass segment-specific context to task creation.
-                company_analysis_data = analyze_company(
-                    company_name=company_name,
-                    company_website=company_website,
-                    agents=agents, # Pass all agents
-                    segment_config=segment_config, # Pass the specific segment_config
-                    client_profile=SJ_MORSE_PROFILE # Pass the overall client profile for USPs etc.
-                )
-
+                processed_websites_this_run.add(website_key) # Add before analysis
+
+                logger.info("        Queued '%s' (%s) for analysis in segment: %s", company_name, company_website, segment_name)
+                companies_to_analyze.append((company_name, company_website))
+
+            # Step 2b (per company): Analyze Companies
+            # analyze_companies runs analyze_company for each queued company (concurrently when
+            # MAX_CONCURRENT_ANALYSES > 1); it selects the segment's analyzer/reviewer agents
+            # and passes segment-specific context to task creation.
+            for company_name, company_website, company_analysis_data in analyze_companies(
+                companies_to_analyze,
+                agents, # Pass all agents
+                segment_config, # Pass the specific segment_config
+                client_profile, # Pass the overall client profile for USPs etc.
+                max_workers=Config.MAX_CONCURRENT_ANALYSES,
+                delay=COMPANY_ANALYSIS_DELAY
+            ):
                 if company_analysis_data:
                     # Store all gathered data.
                     # The 'category' field from the original structure will be replaced by segment_name
@@ -220,10 +266,11 @@ if __name__ == "__main__":
                     company_analysis_data["category"] = segment_name
 
                     all_processed_companies.append(company_analysis_data)
-                    logger.info(f"        Successfully analyzed '{company_name}'. Email: {company_analysis_data.get('contact_email', 'N/A')}, Points: {company_analysis_data.get('pain_points', 'N/A')[:50]}...")
+                    if logger.isEnabledFor(logging.INFO): # Skip the preview slice on quiet runs
+                        logger.info("        Successfully analyzed '%s'. Email: %s, Points: %s...", company_name, company_analysis_data.get('contact_email', 'N/A'), company_analysis_data.get('pain_points', 'N/A')[:50])
                 else:
                     # Log if analysis returns None, though analyze_company should return a dict with error info
-                    logger.error(f"        Analysis for '{company_name}' (segment: {segment_name}) returned no data. This might indicate an issue in analyze_company.")
+                    logger.error("        Analysis for '%s' (segment: %s) returned no data. This might indicate an issue in analyze_company.", company_name, segment_name)
                     # Add a placeholder if necessary to track failures
                     all_processed_companies.append({
                         "name": company_name,
@@ -235,37 +282,31 @@ if __name__ == "__main__":
                         "segment_name_internal": segment_name
                     })
 
-
-                # Optional short delay between analyzing companies from the same URL
-                time.sleep(Config.API_RETRY_DELAY / 2 if Config.API_RETRY_DELAY > 0 else 0.5)
-
-        logger.info(f"  --- Finished processing URLs for segment: {segment_name} ---")
+        logger.info("  --- Finished processing URLs for segment: %s ---", segment_name)
     logger.info("--- Finished Processing All Segments ---")
+    if extracted_count:
+        logger.info("Skipped %s duplicate companies out of %s extracted (%.0f%%).",
+                    duplicate_count, extracted_count, 100 * duplicate_count / extracted_count)
 
     # Step 3: Write Final CSV Output
     if all_processed_companies:
         # Log a summary before writing
         successful_analyses_count = sum(
             1 for c in all_processed_companies
-            if isinstance(c, dict) and c.get("pain_points") not in [
-                "Initial analysis did not run",
-                "Analysis failed - non-string result",
-                "Analysis failed - Task creation error",
-                "Analysis failed to return data" # Our new placeholder
-            ] and not str(c.get("pain_points", "")).startswith("Analysis skipped")
-               and not str(c.get("pain_points", "")).startswith("Analysis failed (")
+            if isinstance(c, dict) and c.get("pain_points") not in _FAILED_ANALYSIS_MARKERS
+               and not str(c.get("pain_points", "")).startswith(_FAILED_ANALYSIS_PREFIXES)
         )
-        logger.info(f"\n--- Pre-CSV Summary ---")
-        logger.info(f"Client: {SJ_MORSE_PROFILE['CLIENT_NAME']}")
-        logger.info(f"Total Entries Processed (attempts): {len(all_processed_companies)}")
-        logger.info(f"Successfully Analyzed Entries: {successful_analyses_count}")
-        for seg_conf in SJ_MORSE_PROFILE["TARGET_SEGMENTS"]:
-            s_name = seg_conf["SEGMENT_NAME"]
+        logger.info("\n--- Pre-CSV Summary ---")
+        logger.info("Client: %s", client_profile['CLIENT_NAME'])
+        logger.info("Total Entries Processed (attempts): %s", len(all_processed_companies))
+        logger.info("Successfully Analyzed Entries: %s", successful_analyses_count)
+        for segment in get_segments():
+            s_name = segment.name
             count = sum(1 for c in all_processed_companies if isinstance(c,dict) and c.get("segment_name_internal") == s_name)
-            logger.info(f"  Entries for Segment '{s_name}': {count}")
-        logger.info(f"--------------------------\n")
+            logger.info("  Entries for Segment '%s': %s", s_name, count)
+        logger.info("--------------------------\n")
 
-        logger.info(f"Writing {len(all_processed_companies)} processed entries (includes failures) to {Config.OUTPUT_PATH}...")
+        logger.info("Writing %s processed entries (includes failures) to %s...", len(all_processed_companies), Config.OUTPUT_PATH)
         # write_to_csv in output_manager.py will still use the old headers for now.
         # It will look for 'category' (which we've temporarily added) 'name', 'website', 'pain_points', 'contact_email', 'source_url'.
         write_to_csv(all_processed_companies, Config.OUTPUT_PATH)
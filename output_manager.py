@@ -1,101 +1,156 @@
 # output_manager.py
 import logging
-import csv
 from datetime import date
+from itertools import chain
+from typing import Iterable
 from config import Config # Import Config to use GENERIC_COMPANY_NAMES
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-def write_to_csv(data: list, filename: str):
+# --- MODIFIED: Added 'Lead Category' to header, placed last ---
+CSV_HEADER = (
+    'Company Name',
+    'Website',
+    'Potential Pain Points',
+    'Contact Email',
+    'Source URL',
+    'Date Added',
+    'Is Duplicate', # Keep duplicate flag before category
+    'Lead Category' # New column added at the end
+)
+# --- END MODIFICATION ---
+# None of the header names need quoting, so the header line is prebuilt once
+# (\r\n line endings, as csv.writer used to emit)
+_CSV_HEADER_LINE = (",".join(CSV_HEADER) + "\r\n").encode('utf-8')
+_CSV_WRITE_BUFFER_BYTES = 1 << 20 # 1 MiB
+# 'Is Duplicate' cell text, looked up instead of calling str() on each row's flag
+_BOOL_STR = {True: 'True', False: 'False'}
+_NO_ENTRY = object() # Sentinel for an exhausted input iterable
+
+
+def _csv_field(value) -> bytes:
+    """
+    Encodes one CSV cell as UTF-8, quoting it the way csv.QUOTE_MINIMAL would.
+
+    Args:
+        value: Cell value; None becomes an empty cell, other non-strings are str()'d
+
+    Returns:
+        bytes: The encoded (and, if needed, quoted) cell
+    """
+    if value.__class__ is not str:
+        value = '' if value is None else str(value)
+    # Most cells (names, URLs, dates) need no quoting and are encoded as-is
+    if ',' in value or '"' in value or '\n' in value or '\r' in value:
+        return b'"' + value.replace('"', '""').encode('utf-8') + b'"'
+    return value.encode('utf-8')
+
+def write_to_csv(data: Iterable[dict], filename: str):
     """
     Writes the processed company data (including category) to a CSV file (OVERWRITING).
 
+    Entries are consumed one at a time, so `data` may be a generator; nothing beyond the
+    in-batch duplicate name set is held in memory.
+
     Args:
-        data: List of company data dictionaries (expected to have 'category' key)
+        data: Iterable of company data dictionaries (expected to have 'category' key)
         filename: Path to output CSV file
     """
-    logger.info(f"Writing data for {len(data)} processed entries to {filename}")
+    logger.info("Writing processed entries to %s", filename)
 
-    if not data:
+    # Peek at the first entry so an empty input still skips creating the file
+    entries = iter(data)
+    first_entry = next(entries, _NO_ENTRY)
+    if first_entry is _NO_ENTRY:
         logger.warning("No data provided to write_to_csv function.")
         return
-
-    # --- MODIFIED: Added 'Lead Category' to header, placed last ---
-    header = [
-        'Company Name',
-        'Website',
-        'Potential Pain Points',
-        'Contact Email',
-        'Source URL',
-        'Date Added',
-        'Is Duplicate', # Keep duplicate flag before category
-        'Lead Category' # New column added at the end
-    ]
-    # --- END MODIFICATION ---
+    entries = chain((first_entry,), entries)
 
     # Use set for efficient duplicate name checking within the output batch
     processed_company_names_in_batch = set()
+    entries_seen = 0
     rows_written = 0
     skipped_generic = 0
     skipped_missing_data = 0
+    skipped_non_dict = 0
     today_date = date.today().isoformat()
+    debug_enabled = logger.isEnabledFor(logging.DEBUG) # Checked once, not per skipped row
+
+    def iter_rows():
+        """Yield one normalized row per usable entry, so rows stream to the file without a buffer list."""
+        nonlocal entries_seen, rows_written, skipped_generic, skipped_missing_data, skipped_non_dict
+        # Module globals and bound methods used per row, resolved once as fast locals
+        generic_names = Config.GENERIC_COMPANY_NAMES # Already a lowercase frozenset
+        bool_str = _BOOL_STR
+        seen_names = processed_company_names_in_batch
+        mark_seen = seen_names.add
+        for company_info in entries:
+            entries_seen += 1
+            # Ensure it's a dictionary
+            if not isinstance(company_info, dict):
+                skipped_non_dict += 1
+                continue
+            _get = company_info.get # Bound once per entry; used for every column below
+            company_name = _get('name', '').strip()
+            company_category = _get('category', 'Unknown') # Get category
+
+            # Basic check for essential data
+            if not company_name:
+                logger.warning("Skipping entry with missing company name: %s", _get('website', 'N/A'))
+                skipped_missing_data += 1
+                continue
+
+            company_name_lower = company_name.lower() # Computed once; reused for the duplicate check
+
+            # Skip generic company names (using Config)
+            if company_name_lower in generic_names:
+                if debug_enabled:
+                    logger.debug("Skipping CSV write for generic name: '%s'", company_name)
+                skipped_generic += 1
+                continue
+
+            # Check for duplicates *within this specific output batch*
+            # NOTE: This doesn't check against previous runs. Case-insensitive, so "ACME" matches "Acme".
+            is_duplicate_in_batch = company_name_lower in seen_names
+            mark_seen(company_name_lower)
+
+            # Prepare row data including the new category
+            row = (
+                company_name,
+                _get('website', 'N/A'),
+                _get('pain_points', ''),
+                _get('contact_email', ''),
+                _get('source_url', 'N/A'),
+                today_date,
+                bool_str[is_duplicate_in_batch], # Duplicate status within this run
+                company_category # Add the category value here
+            )
+            rows_written += 1
+            yield row
 
     try:
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(header)
-
-            for company_info in data:
-                # Ensure it's a dictionary
-                if not isinstance(company_info, dict):
-                    logger.warning(f"Skipping non-dictionary item in data: {type(company_info)}")
-                    skipped_missing_data += 1
-                    continue
-
-                company_name = company_info.get('name', '').strip()
-                company_category = company_info.get('category', 'Unknown') # Get category
-
-                # Basic check for essential data
-                if not company_name:
-                    logger.warning(f"Skipping entry with missing company name: {company_info.get('website', 'N/A')}")
-                    skipped_missing_data += 1
-                    continue
-
-                # Skip generic company names (using Config)
-                if company_name.lower() in Config.GENERIC_COMPANY_NAMES:
-                    logger.debug(f"Skipping CSV write for generic name: '{company_name}'")
-                    skipped_generic += 1
-                    continue
-
-                # Check for duplicates *within this specific output batch*
-                # NOTE: This doesn't check against previous runs.
-                is_duplicate_in_batch = company_name in processed_company_names_in_batch
-                processed_company_names_in_batch.add(company_name)
-
-                # Prepare row data including the new category
-                row = [
-                    company_name,
-                    company_info.get('website', 'N/A'),
-                    company_info.get('pain_points', ''),
-                    company_info.get('contact_email', ''),
-                    company_info.get('source_url', 'N/A'),
-                    today_date,
-                    str(is_duplicate_in_batch), # Duplicate status within this run
-                    company_category # Add the category value here
-                ]
-                writer.writerow(row)
-                rows_written += 1
-
-        logger.info(f"Successfully wrote {rows_written} company rows to {filename} (overwrite mode).")
+        # Rows are encoded by hand and written as bytes, skipping csv.writer and the text layer.
+        # Large write buffer: rows accumulate in memory and reach the OS in few big writes
+        with open(filename, 'wb', buffering=_CSV_WRITE_BUFFER_BYTES) as csvfile:
+            write = csvfile.write
+            write(_CSV_HEADER_LINE)
+            for row in iter_rows():
+                write(b','.join(map(_csv_field, row)) + b'\r\n')
+
+        logger.info("Successfully wrote %s company rows from %s processed entries to %s (overwrite mode).", rows_written, entries_seen, filename)
+        if skipped_non_dict > 0:
+            # Reported once rather than per item
+            logger.warning("Skipped %s non-dictionary item(s) in data.", skipped_non_dict)
+            skipped_missing_data += skipped_non_dict
         if skipped_generic > 0:
-            logger.info(f"Skipped writing {skipped_generic} entries due to generic names.")
+            logger.info("Skipped writing %s entries due to generic names.", skipped_generic)
         if skipped_missing_data > 0:
-             logger.info(f"Skipped writing {skipped_missing_data} entries due to missing essential data.")
+             logger.info("Skipped writing %s entries due to missing essential data.", skipped_missing_data)
         # Log count of unique names identified *in this batch* for clarity
-        logger.info(f"Identified {len(processed_company_names_in_batch)} unique company names in this batch.")
+        logger.info("Identified %s unique company names in this batch.", len(processed_company_names_in_batch))
 
     except IOError as e:
-        logger.error(f"Error writing CSV file {filename}: {e}", exc_info=True)
+        logger.error("Error writing CSV file %s: %s", filename, e, exc_info=True)
     except Exception as e:
-        logger.error(f"Unexpected error during CSV writing: {e}", exc_info=True)
+        logger.error("Unexpected error during CSV writing: %s", e, exc_info=True)
@@ -1,10 +1,113 @@
 # tasks.py
+import json
 import logging
+import functools
+import string
+from collections.abc import Mapping
 from crewai import Task, Agent
-from config import SJ_MORSE_PROFILE # To provide client context directly in task descriptions
+from config import get_sj_morse_profile # To provide client context directly in task descriptions
 
 logger = logging.getLogger(__name__)
 
+
+@functools.cache
+def _default_client_name() -> str:
+    """CLIENT_NAME from the SJ Morse profile, looked up once on first use (the profile itself loads lazily)."""
+    return get_sj_morse_profile().get("CLIENT_NAME", "our client")
+
+
+# --- Description templates ---
+# Parsed once at import. Placeholders are $name fields; callers substitute the
+# per-segment and per-company values. Kept terse and sectioned: this text is resent
+# on every LLM turn of its task, and the agents' role/backstory already carry the framing.
+
+_PLAN_SEARCH_DESCRIPTION = string.Template(
+    "<goal>Write 3-5 targeted web search queries that find sources listing multiple companies in the "
+    "'$segment_name' segment (potential clients of $client_name).</goal>\n"
+    "<inputs>Geographic focus: $geographic_focus_text\n"
+    "Example keywords to adapt: $search_keywords</inputs>\n"
+    "<guidance>Prefer queries that surface lists, directories, association member pages and articles naming several companies.</guidance>"
+)
+_PLAN_SEARCH_EXPECTED_OUTPUT = "A Python list of 3-5 search query strings."
+_EXECUTE_SEARCH_DESCRIPTION = string.Template(
+    "<goal>Run the planned search queries and collect the most relevant sources for the '$segment_name' segment "
+    "(geographic focus: $geographic_focus_text).</goal>\n"
+    "<guidance>Prefer pages listing multiple companies that fit the segment; drop irrelevant results.</guidance>"
+)
+_EXECUTE_SEARCH_EXPECTED_OUTPUT = (
+    "ONLY a Python list of up to 10 unique URL strings: start with '[' and end with ']', no other text. "
+    "Example: ['https://example.com/list1', 'https://anothersite.org/article']"
+)
+
+_EXTRACTION_DESCRIPTION = string.Template(
+    "<steps>1) Scrape $url with the Generic Web Content Scraper tool.\n"
+    "2) Identify the companies mentioned (potential leads for $client_name) with each one's official name and "
+    "primary website URL. Use only facts stated on the page.</steps>\n"
+    "<output_format>Python list of dicts with 'name' and 'website' keys, e.g. "
+    "[{'name': 'Acme Corp', 'website': 'https://www.acme.com'}]</output_format>"
+)
+_EXTRACTION_EXPECTED_OUTPUT = (
+    "A Python list of {'name': ..., 'website': ...} dicts for the companies on the page, or [] if none."
+)
+
+_BATCH_EXTRACTION_DESCRIPTION = string.Template(
+    "<steps>1) Call the Batch Generic Web Content Scraper tool ONCE with this URL list: $urls "
+    "(it returns a JSON object of URL -> page text).\n"
+    "2) For each page, identify the companies mentioned (potential leads for $client_name) with each one's official "
+    "name and primary website URL. Use only facts stated on the page.</steps>\n"
+    "<output_format>JSON object mapping every source URL above to a list of {\"name\", \"website\"} dicts ([] when none), e.g. "
+    "{\"https://source-one.com/list\": [{\"name\": \"Acme Corp\", \"website\": \"https://www.acme.com\"}], "
+    "\"https://source-two.org/article\": []}</output_format>"
+)
+_BATCH_EXTRACTION_EXPECTED_OUTPUT = (
+    "A JSON object of source URL -> list of {\"name\": ..., \"website\": ...} dicts, covering every URL given."
+)
+
+_ANALYSIS_DESCRIPTION = string.Template(
+    "<inputs>Company: '$company_name' ($company_website)\n"
+    "Segment: '$segment_name'\n"
+    "Client: $client_name (premium custom architectural wood veneer panel manufacturer)</inputs>\n"
+    "<steps>Call Company Contact and Pain Point Analyzer ONCE with company_name '$company_name', website "
+    "'$company_website', the '$segment_name' segment config and the $client_name client profile. It finds a general "
+    "contact email and 3-5 pain points that $client_name's products/services can address.</steps>\n"
+    "<output_format>Contact Email: <email, or 'Email not found.'>\n"
+    "Pain Points:\n"
+    "<the analyzer's 3-5 numbered points></output_format>"
+)
+_ANALYSIS_EXPECTED_OUTPUT = (
+    "A 'Contact Email:' line (address or 'Email not found.'), then 'Pain Points:' followed by 3-5 numbered, specific points. "
+    "Example:\n"
+    "Contact Email: info@examplecontractors.com\n"
+    "Pain Points:\n"
+    "1. Unreliable suppliers of specialized veneer put tight project deadlines at risk.\n"
+    "2. Inconsistent AWI Premium Grade quality across large-scale projects.\n"
+    "3. Costly on-site adjustments for panels that are not accurately cut to size."
+)
+
+_REVIEW_DESCRIPTION = string.Template(
+    "<inputs>Company: '$company_name' ($company_website)\n"
+    "Segment: '$segment_name' (typical challenges $client_name solves: $segment_pain_examples_summary)\n"
+    "Initial pain points:\n$formatted_initial_points</inputs>\n"
+    "<steps>1) Check each point is concrete and tied to how a '$segment_name' company specifies, sources or installs "
+    "architectural wood veneer, not a generic business platitude.\n"
+    "2) Keep only points that $client_name's offerings (e.g. AWI Premium Grade panels, custom CNC work, reliable regional "
+    "delivery, cut-to-size services) clearly solve.\n"
+    "3) Sharpen vague points into specific problems (e.g. 'improve material sourcing' -> 'inconsistent quality and long "
+    "lead times for specialized veneers delay project schedules'); drop irrelevant ones, replacing them where possible to keep 3-5.\n"
+    "4) Each final point should give sales a clear angle for approaching '$company_name'.</steps>\n"
+    "<output_format>ONLY a numbered list of 3-5 final pain points, starting with '1.'; no reasoning or other text.</output_format>"
+)
+_REVIEW_EXPECTED_OUTPUT = string.Template(
+    "A numbered list of 3-5 specific pain points for this '$segment_name' company that $client_name's custom "
+    "architectural wood veneer panels solve, and nothing else. Example:\n"
+    "1. Hard to source exotic veneers that meet both the design intent and AWI Premium Grade for high-end hospitality projects.\n"
+    "2. Delays and overruns from inconsistent or damaged panels sourced from multiple suppliers.\n"
+    "3. Limited in-house cut-to-size and edge-banding capacity, raising on-site labor costs and waste."
+)
+# Stand-in bullet for a review whose initial analysis produced no usable lines
+_NO_INITIAL_POINTS = "  - No specific initial pain points were provided or extracted clearly."
+
+
 # --- SEARCH TASKS (Segment-Specific - Assumed to be correct from previous step) ---
 
 def create_search_tasks(research_agent: Agent, segment_config: dict):
@@ -13,123 +116,166 @@ def create_search_tasks(research_agent: Agent, segment_config: dict):
     (Assumed to be correct from previous step)
     """
     segment_name = segment_config.get("SEGMENT_NAME", "Unknown Segment")
-    logger.info(f"Creating search tasks for segment: {segment_name}...")
+    logger.info("Creating search tasks for segment: %s...", segment_name)
 
     if not isinstance(research_agent, Agent):
-        logger.error(f"Invalid research_agent provided for segment {segment_name}. Cannot create search tasks.")
+        logger.error("Invalid research_agent provided for segment %s. Cannot create search tasks.", segment_name)
         return []
-    if not segment_config or not isinstance(segment_config, dict):
-        logger.error(f"Invalid segment_config provided for segment {segment_name}. Cannot create search tasks.")
+    if not segment_config or not isinstance(segment_config, Mapping):
+        logger.error("Invalid segment_config provided for segment %s. Cannot create search tasks.", segment_name)
         return []
 
     search_keywords_examples = segment_config.get("SEARCH_KEYWORDS_EXAMPLES", ["general business news"])
     geographic_focus_text = segment_config.get("GEOGRAPHIC_FOCUS_TEXT", "the specified region")
-    client_name = SJ_MORSE_PROFILE.get("CLIENT_NAME", "our client")
-
-    plan_search_description = (
-        f"Develop a list of 3-5 highly targeted search queries to find online sources "
-        f"(articles, lists, directories, industry association member lists) that identify companies "
-        f"fitting the profile of '{segment_name}'.\n"
-        f"These companies are potential clients for {client_name}, a manufacturer of custom architectural wood veneer panels.\n"
-        f"The geographic focus for this segment is: {geographic_focus_text}.\n"
-        f"Example search keywords to consider and adapt: {', '.join(search_keywords_examples)}.\n"
-        f"Prioritize queries that will find sources listing multiple relevant companies."
-    )
-    plan_expected_output = (
-        "A Python list of 3-5 targeted search query strings specifically designed to find "
-        f"sources listing companies within the '{segment_name}' segment, considering the "
-        f"geographic focus: {geographic_focus_text}."
-    )
-    
-    execute_search_description = (
-        "Execute web searches using the provided list of targeted queries. "
-        f"Find the most relevant articles, lists, or directories for the '{segment_name}' segment, "
-        f"keeping in mind the geographic focus: {geographic_focus_text}. "
-        "Prioritize sources that are likely to list multiple companies fitting this segment profile. "
-        "Filter out irrelevant results."
-    )
-    execute_expected_output = (
-        "**CRITICAL:** Your final output MUST be ONLY a Python list of strings, where each string is a unique URL. "
-        "Example format: ['https://example.com/list1', 'https://anothersite.org/article', 'https://regionalsource.net/directory']\n"
-        "Do NOT include any introductory text, concluding remarks, notes, or any other text before or after the Python list itself. "
-        "The output should start directly with '[' and end directly with ']'. Provide up to 10 unique URLs relevant to the search queries."
-    )
+    client_name = _default_client_name()
+
+    search_fields = {
+        "segment_name": segment_name,
+        "client_name": client_name,
+        "geographic_focus_text": geographic_focus_text,
+        "search_keywords": ", ".join(search_keywords_examples),
+    }
+    plan_search_description = _PLAN_SEARCH_DESCRIPTION.substitute(search_fields)
+    execute_search_description = _EXECUTE_SEARCH_DESCRIPTION.substitute(search_fields)
 
     try:
         plan_search_task = Task(
             description=plan_search_description,
-            expected_output=plan_expected_output,
+            expected_output=_PLAN_SEARCH_EXPECTED_OUTPUT,
             agent=research_agent
         )
         execute_search_task = Task(
             description=execute_search_description,
-            expected_output=execute_expected_output,
+            expected_output=_EXECUTE_SEARCH_EXPECTED_OUTPUT,
             agent=research_agent,
             context=[plan_search_task]
         )
-        logger.debug(f"Search tasks created successfully for segment: {segment_name}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Search tasks created successfully for segment: %s", segment_name)
         return [plan_search_task, execute_search_task]
     except Exception as e:
-        logger.error(f"Error creating search tasks for segment {segment_name}: {e}", exc_info=True)
+        logger.error("Error creating search tasks for segment %s: %s", segment_name, e, exc_info=True)
         return []
 
 
 # --- EXTRACTION TASK (Segment-Aware but General Scraper - Assumed correct) ---
 
+@functools.lru_cache(maxsize=2048)
+def _extraction_description(url: str) -> str:
+    """Extraction task description for a URL, built once per URL (URLs recur across segments)."""
+    return _EXTRACTION_DESCRIPTION.substitute(url=url, client_name=_default_client_name())
+
+
 def create_extraction_task(url: str, research_agent: Agent):
     """
     Create a task for the Research Agent to extract company information from a given URL.
     (Assumed to be correct from previous step)
+
+    Only the description text is memoized per URL; each call returns a new Task, since a
+    Task keeps its agent binding and output from the crew that ran it.
     """
-    logger.info(f"Creating extraction task for URL: {url}")
+    logger.info("Creating extraction task for URL: %s", url)
     if not isinstance(research_agent, Agent):
-         logger.error(f"Research agent not found or invalid in create_extraction_task for URL {url}. Cannot create task.")
+         logger.error("Research agent not found or invalid in create_extraction_task for URL %s. Cannot create task.", url)
          return None
     if not url or not isinstance(url, str):
-        logger.error(f"Invalid URL provided for extraction task: {url}")
+        logger.error("Invalid URL provided for extraction task: %s", url)
         return None
 
-    client_name = SJ_MORSE_PROFILE.get("CLIENT_NAME", "our client")
-    extraction_description = (
-        f"Use the Generic Scraper tool to scrape the content from the URL: {url}\n"
-        f"Analyze the scraped text content to identify companies mentioned. These companies are potential leads for {client_name}.\n"
-        "For each company identified, determine their official company name and their primary website URL. "
-        "Focus on extracting factual information. Avoid making assumptions about the company's industry "
-        "unless explicitly stated on the page.\n"
-        "Return the results as a Python list of dictionaries, where each dictionary has 'name' and 'website' keys. "
-        "Example: [{'name': 'Acme Corp', 'website': 'https://www.acme.com'}, ...]"
-    )
-    extraction_expected_output = (
-        "A Python list of dictionaries, each containing 'name' and 'website' for companies "
-        "identified on the page. If no companies are found, return an empty list. "
-        "Format: [{'name': 'Company Name', 'website': 'https://company-website.com'}, ...]"
-    )
     try:
         extraction_task = Task(
-            description=extraction_description,
-            expected_output=extraction_expected_output,
+            description=_extraction_description(url),
+            expected_output=_EXTRACTION_EXPECTED_OUTPUT,
             agent=research_agent
         )
-        logger.debug(f"Extraction task created successfully for {url}.")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Extraction task created successfully for %s.", url)
         return extraction_task
     except Exception as e:
-        logger.error(f"Error creating extraction task for {url}: {e}", exc_info=True)
+        logger.error("Error creating extraction task for %s: %s", url, e, exc_info=True)
         return None
 
 
+def create_batch_extraction_task(urls: list[str], research_agent: Agent) -> Task | None:
+    """
+    Create one task for the Research Agent to extract company information from several URLs.
+
+    The agent scrapes all pages with a single Batch Generic Web Content Scraper call and returns
+    companies grouped by source URL, instead of one task (and LLM round-trip) per URL.
+    """
+    logger.info("Creating batch extraction task for %s URLs.", len(urls) if urls else 0)
+    if not isinstance(research_agent, Agent):
+        logger.error("Research agent not found or invalid in create_batch_extraction_task. Cannot create task.")
+        return None
+    if not urls or not all(isinstance(url, str) and url for url in urls):
+        logger.error("Invalid URL list provided for batch extraction task: %s", urls)
+        return None
+
+    batch_extraction_description = _BATCH_EXTRACTION_DESCRIPTION.substitute(
+        urls=json.dumps(list(urls)), client_name=_default_client_name()
+    )
+    try:
+        batch_extraction_task = Task(
+            description=batch_extraction_description,
+            expected_output=_BATCH_EXTRACTION_EXPECTED_OUTPUT,
+            agent=research_agent
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Batch extraction task created successfully for %s URLs.", len(urls))
+        return batch_extraction_task
+    except Exception as e:
+        logger.error("Error creating batch extraction task: %s", e, exc_info=True)
+        return None
+
+
+# --- Cached, company-invariant description text ---
+# Task descriptions are mostly segment/client boilerplate. Those fields are filled in once per
+# segment here, leaving a Template with only the per-company $fields still open.
+
+def _template_escape(text: str) -> str:
+    """Escape '$' in profile text so it is kept literally by the later substitute call."""
+    return text.replace("$", "$$")
+
+
+@functools.lru_cache(maxsize=64)
+def _analysis_description_template(segment_name: str, client_name: str) -> string.Template:
+    """Analysis task description with $company_name and $company_website still open."""
+    return string.Template(_ANALYSIS_DESCRIPTION.safe_substitute(
+        segment_name=_template_escape(segment_name),
+        client_name=_template_escape(client_name),
+    ))
+
+
+@functools.lru_cache(maxsize=64)
+def _review_description_template(segment_name: str, client_name: str, segment_pain_examples: tuple) -> string.Template:
+    """Review task description with $company_name, $company_website and $formatted_initial_points still open."""
+    return string.Template(_REVIEW_DESCRIPTION.safe_substitute(
+        segment_name=_template_escape(segment_name),
+        client_name=_template_escape(client_name),
+        segment_pain_examples_summary=_template_escape("; ".join(segment_pain_examples)),
+    ))
+
+
+@functools.lru_cache(maxsize=64)
+def _review_expected_output(segment_name: str, client_name: str) -> str:
+    """Review task expected output; depends only on the segment and client."""
+    return _REVIEW_EXPECTED_OUTPUT.substitute(segment_name=segment_name, client_name=client_name)
+
+
 # --- ANALYSIS TASK (Fully Implemented) ---
 
 def create_analysis_task(company_name: str, company_website: str, analysis_agent: Agent, segment_config: dict, client_profile: dict) -> Task | None:
     """
     Create a task to analyze a company (find email and identify pain points)
     using the provided analysis_agent and contextual information.
+    Returns None for missing arguments; Task construction errors are raised to the caller.
     """
     segment_name = segment_config.get("SEGMENT_NAME", "Unknown Segment")
     client_name = client_profile.get("CLIENT_NAME", "Our Client")
-    logger.info(f"Creating analysis task for '{company_name}' (Segment: {segment_name}) using agent: {analysis_agent.role if analysis_agent else 'N/A'}")
+    logger.info("Creating analysis task for '%s' (Segment: %s) using agent: %s", company_name, segment_name, getattr(analysis_agent, 'role', 'N/A'))
 
     if not all([analysis_agent, segment_config, client_profile, company_name, company_website]):
-        logger.error(f"Missing required arguments for analysis task creation for {company_name}.")
+        logger.error("Missing required arguments for analysis task creation for %s.", company_name)
         return None
 
     # For the `Company Pain Point Analyzer` tool, we need to pass specific arguments.
@@ -155,45 +301,22 @@ def create_analysis_task(company_name: str, company_website: str, analysis_agent
     # will need to map the agent's decision to call the tool with the parameters.
     # The description primes the agent.
 
-    analysis_task_description = (
-        f"Your mission is to analyze the company '{company_name}' (Website: {company_website}). "
-        f"This company is categorized under the '{segment_name}' segment and is a potential client for {client_name}.\n\n"
-        f"Follow these steps:\n"
-        f"1.  **Find Contact Email:** Use the 'Unified Email Finder' tool with the company's website ('{company_website}') to find a general contact email address (e.g., info@, sales@, contact@). Prioritize non-personal, role-based, or departmental emails if available.\n\n"
-        f"2.  **Analyze Pain Points:** Use the 'Company Pain Point Analyzer' tool. "
-        f"You will need to provide it with the company's name ('{company_name}'), the segment configuration for '{segment_name}', and the client profile for '{client_name}'. "
-        f"The tool will help identify 3-5 specific business pain points or opportunities this company likely faces that {client_name} (a premium manufacturer of custom architectural wood veneer panels) can address. "
-        f"Focus on challenges relevant to their potential need for {client_name}'s products/services.\n\n"
-        f"3.  **Format Output:** Combine the findings into a single, structured response. "
-        f"Start with 'Contact Email:' followed by the email found (or 'Email not found.'). "
-        f"Then, on a new line, start with 'Pain Points:' followed by the numbered or bulleted list of 3-5 pain points provided by the 'Company Pain Point Analyzer' tool."
+    analysis_task_description = _analysis_description_template(segment_name, client_name).substitute(
+        company_name=company_name, company_website=company_website
     )
 
-    analysis_expected_output = (
-        "A structured response. It MUST start with 'Contact Email:' followed by the email address (or 'Email not found.').\n"
-        "On a new line, it MUST start with 'Pain Points:' followed by a numbered or bulleted list of 3-5 specific pain points. "
-        "Example:\n"
-        "Contact Email: info@examplecontractors.com\n"
-        "Pain Points:\n"
-        "1. Difficulty meeting tight project deadlines due to unreliable material suppliers for specialized veneer.\n"
-        "2. Challenges ensuring consistent AWI Premium Grade quality for veneer panels across large-scale projects.\n"
-        "3. High costs associated with on-site adjustments for veneer panels that are not cut-to-size accurately."
+    # Inputs are validated above; a Task construction error propagates to analyze_company, which logs it.
+    analysis_task = Task(
+        description=analysis_task_description,
+        expected_output=_ANALYSIS_EXPECTED_OUTPUT,
+        agent=analysis_agent,
+        # Tools are defined at the agent level, but specifying them here can sometimes help the LLM focus.
+        # However, it's generally better if the agent knows its tools from its definition.
+        # tools=[tools_dict['parallel_analyzer']] # Optional: if agent has many tools
     )
-
-    try:
-        analysis_task = Task(
-            description=analysis_task_description,
-            expected_output=analysis_expected_output,
-            agent=analysis_agent,
-            # Tools are defined at the agent level, but specifying them here can sometimes help the LLM focus.
-            # However, it's generally better if the agent knows its tools from its definition.
-            # tools=[tools_dict['email_finder'], tools_dict['pain_point_analyzer']] # Optional: if agent has many tools
-        )
-        logger.debug(f"Analysis task created successfully for {company_name} ({segment_name})")
-        return analysis_task
-    except Exception as e:
-        logger.error(f"Error creating analysis task for {company_name}: {e}", exc_info=True)
-        return None
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Analysis task created successfully for %s (%s)", company_name, segment_name)
+    return analysis_task
 
 
 # --- REVIEW TASK (Fully Implemented) ---
@@ -202,63 +325,42 @@ def create_review_task(company_name: str, company_website: str, initial_pain_poi
     """
     Create a task to review and refine initially generated pain points
     using the provided review_agent and contextual information.
+    Returns None for missing arguments; Task construction errors are raised to the caller.
     """
     segment_name = segment_config.get("SEGMENT_NAME", "Unknown Segment")
     client_name = client_profile.get("CLIENT_NAME", "Our Client")
-    logger.info(f"Creating review task for '{company_name}' (Segment: {segment_name}) using agent: {review_agent.role if review_agent else 'N/A'}")
+    logger.info("Creating review task for '%s' (Segment: %s) using agent: %s", company_name, segment_name, getattr(review_agent, 'role', 'N/A'))
 
     if not all([review_agent, segment_config, client_profile, company_name, company_website, initial_pain_points is not None]): # initial_pain_points can be empty string
-        logger.error(f"Missing required arguments for review task creation for {company_name}.")
+        logger.error("Missing required arguments for review task creation for %s.", company_name)
         return None
 
-    client_usps_summary = "; ".join(client_profile.get("CORE_PRODUCTS_USPS", ["providing valuable solutions"]))
-    segment_pain_examples_summary = "; ".join(segment_config.get("SEGMENT_SPECIFIC_PAIN_POINTS_SJ_MORSE_CAN_SOLVE", ["their specific needs"]))
-
-    # Ensure initial_pain_points is formatted clearly if it's a multi-line string
-    formatted_initial_points = "\n".join([f"  - {line.strip()}" for line in initial_pain_points.split('\n') if line.strip()])
-    if not formatted_initial_points:
-        formatted_initial_points = "  - No specific initial pain points were provided or extracted clearly."
-
-    review_task_description = (
-        f"**You are a Senior Lead Qualification Analyst for {client_name}.**\n"
-        f"{client_name} specializes in: {client_usps_summary}.\n\n"
-        f"**Company Under Review:** '{company_name}' (Website: {company_website})\n"
-        f"**Segment:** '{segment_name}' (Typical segment challenges that {client_name} addresses: {segment_pain_examples_summary})\n\n"
-        f"**Initial Pain Points Submitted for Review:**\n{formatted_initial_points}\n\n"
-        f"**Your Critical Review Objectives:**\n"
-        f"1.  **Validate Specificity & Relevance:** Scrutinize each initial pain point. Is it concrete and directly related to the challenges a '{segment_name}' company would face concerning architectural wood veneer panels? Does it avoid generic business platitudes?\n"
-        f"2.  **Align with {client_name}'s Solutions:** Does each point clearly highlight a problem that {client_name}'s specific products (e.g., AWI Premium Grade panels, custom CNC work, reliable regional delivery, cut-to-size services) can solve effectively? The connection must be obvious.\n"
-        f"3.  **Refine or Reject:**\n"
-           f"*   If a point is too vague (e.g., 'improve material sourcing'), REFINE it into a specific, compelling problem (e.g., 'Experiences inconsistent quality and long lead times when sourcing specialized veneers, impacting project schedules and finish standards.').\n"
-           f"*   If a point is irrelevant to {client_name}'s veneer business or unfixably generic, REJECT it and explain briefly in your thought process (not in the final output list). Aim to replace rejected points if possible to maintain 3-5 quality points.\n"
-        f"4.  **Ensure Actionability:** The refined pain points should give the sales team a clear angle for approaching '{company_name}'.\n\n"
-        f"**Final Output Requirements:**\n"
-        f"Produce ONLY a numbered list of 3-5 **final, high-quality, refined or validated pain points**. "
-        f"Each point must be a compelling reason for '{company_name}' to consider {client_name} for their architectural wood veneer needs. "
-        f"Do NOT include your reasoning or any text other than the final list itself. Start directly with '1.'."
-    )
+    # Tuple keeps the cache key hashable whether the profile holds lists or tuples
+    segment_pain_examples = tuple(segment_config.get("SEGMENT_SPECIFIC_PAIN_POINTS_SJ_MORSE_CAN_SOLVE", ("their specific needs",)))
 
-    review_expected_output = (
-        "A final, refined list of 3-5 specific business pain points for the company, "
-        f"clearly relevant to the '{segment_name}' segment and demonstrating how {client_name}'s "
-        "custom architectural wood veneer panels can provide a solution. "
-        "The output should be ONLY a numbered or bulleted list. "
-        "Example:\n"
-        "1. Consistent difficulty in sourcing specific exotic veneers that meet both aesthetic requirements and AWI Premium Grade standards for high-end hospitality projects.\n"
-        "2. Project delays and budget overruns due to inconsistencies or damage in veneer panels sourced from multiple, less reliable suppliers.\n"
-        "3. Limited in-house capacity for precise cut-to-size and edge-banding of veneer panels, increasing on-site labor costs and waste."
+    # Ensure initial_pain_points is formatted clearly if it's a multi-line string (each line stripped once, no temp list)
+    formatted_initial_points = "\n".join(
+        f"  - {line}" for line in (raw_line.strip() for raw_line in initial_pain_points.splitlines()) if line
+    ) or _NO_INITIAL_POINTS
+
+    review_task_description = _review_description_template(
+        segment_name, client_name, segment_pain_examples
+    ).substitute(
+        company_name=company_name,
+        company_website=company_website,
+        formatted_initial_points=formatted_initial_points,
     )
 
-    try:
-        review_task = Task(
-            description=review_task_description,
-            expected_output=review_expected_output,
-            agent=review_agent
-            # No tools typically assigned to reviewer agent, it relies on LLM reasoning.
-        )
-        logger.debug(f"Review task created successfully for {company_name} ({segment_name})")
-        return review_task
-    except Exception as e:
-        logger.error(f"Error creating review task for {company_name}: {e}", exc_info=True)
-        return None
+    review_expected_output = _review_expected_output(segment_name, client_name)
+
+    # Inputs are validated above; a Task construction error propagates to analyze_company, which logs it.
+    review_task = Task(
+        description=review_task_description,
+        expected_output=review_expected_output,
+        agent=review_agent
+        # No tools typically assigned to reviewer agent, it relies on LLM reasoning.
+    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Review task created successfully for %s (%s)", company_name, segment_name)
+    return review_task
 
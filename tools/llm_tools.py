@@ -1,12 +1,97 @@
 # tools/llm_tools.py
+import hashlib
 import logging
+import re
+import functools
+import threading
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from crewai.tools import BaseTool
+from config import Config
+from utils.api_cache import APICache
 from utils.llm_factory import get_llm_instance
-from langchain_core.messages import HumanMessage #, SystemMessage (if you want to add system messages)
+from langchain_core.messages import HumanMessage, SystemMessage
 from utils.error_handler import handle_api_error # Assuming retry isn't needed here for a single LLM call
+from tools.unified_email_finder import unified_email_finder_tool
 
 logger = logging.getLogger(__name__)
 
+# Successful analyses, keyed by a hash of the provider settings and the full prompt. A company met
+# again in the same run (e.g. listed on several source URLs) reuses its result instead of a new LLM call.
+_analysis_cache = APICache(ttl_seconds=24 * 3600, max_entries=4096)
+_analysis_cache_stats = {"hits": 0, "misses": 0}
+_analysis_cache_stats_lock = threading.Lock() # Companies are analyzed on several threads (MAX_CONCURRENT_ANALYSES)
+# First numbered line ("1.", "12.") of an LLM reply; anything before it is preamble
+_FIRST_NUMBERED_LINE = re.compile(r"^\s*\d+\.", re.MULTILINE)
+# Prompt fallbacks for missing/empty profile fields (tuples, so no list is built per call)
+_DEFAULT_USPS = ("specialized solutions",)
+_DEFAULT_PAINS = ("their unique challenges",)
+_DEFAULT_FOCUS = "custom solutions"
+
+
+def _analysis_cache_key(prompt_text: str) -> str:
+    """Cache key for a pain point prompt under the currently configured LLM provider/model/temperature."""
+    key_source = f"{Config.LLM_PROVIDER}|{Config.PAIN_POINT_MODEL}|{Config.LLM_TEMPERATURE}|{prompt_text}"
+    return hashlib.blake2b(key_source.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@functools.lru_cache(maxsize=64)
+def _static_prompt(client_name: str, client_usps_str: str, segment_name: str, segment_product_focus: str, segment_pain_examples_str: str) -> str:
+    """
+    Invariant part of the pain point prompt: role, segment profile, guidelines and examples.
+
+    Nothing company-specific goes in here, so every call for the same segment/client sends a
+    byte-identical prefix that the provider's prompt cache can reuse.
+    """
+    return (
+        f"**You are a specialized business consultant for {client_name}.**\n"
+        f"{client_name} is a premium US-based manufacturer of custom architectural wood veneer panels. "
+        f"Key strengths: {client_usps_str}.\n\n"
+        f"**Segment Profile:**\n"
+        f"- Segment: '{segment_name}'\n"
+        f"- Likely Needs related to Architectural Veneer: {segment_product_focus}. Based on their segment, companies often encounter issues such as: {segment_pain_examples_str}.\n\n"
+        f"**Your Objective:**\n"
+        f"For the company named in the next message, identify exactly 3 to 5 **highly specific and distinct** business pain points OR unmet needs that {client_name} can directly solve with their custom architectural wood veneer panels and associated services. "
+        f"Each pain point should clearly imply why that company would benefit from partnering with a specialized, high-quality veneer supplier like {client_name}.\n\n"
+        f"**CRITICAL GUIDELINES for Pain Points:**\n"
+        f"1.  **Specificity is Key:** Focus on practical, operational, project-specific, or quality-control challenges related to specifying, sourcing, or installing wood veneer. "
+        f"For example, instead of 'improve quality,' specify 'risk of using non-AWI compliant veneers leading to project rejection.'\n"
+        f"2.  **Directly Solvable by {client_name}:** Each point MUST be something {client_name}'s products/services (like AWI Premium Grade, custom capabilities, cut-to-size, reliable delivery) can address.\n"
+        f"3.  **Avoid Generic Business Advice:** DO NOT list high-level, generic issues like 'increase profits,' 'reduce costs,' 'improve marketing,' 'find more customers,' or 'manage competition' UNLESS you can tie it *extremely specifically* to a veneer-related problem that {client_name} solves. (e.g., 'High material waste and labor costs due to inaccurately sized veneer panels' is acceptable because cut-to-size services address it).\n"
+        f"4.  **Imply a \"Why Now?\" or \"Why Us?\":** The pain should be significant enough to warrant considering a new or specialized supplier like {client_name}.\n" # Note: Escaped quotes around "Why Now?"
+        f"5.  **Distinct Points:** Ensure each of the 3-5 points is different and not just a rephrasing of another.\n\n"
+        f"**Output Format:**\n"
+        f"Provide ONLY a concise, numbered list of these 3-5 pain points/needs. "
+        f"NO introductory sentences, NO concluding remarks, NO explanations beyond the points themselves. Start directly with '1.'\n\n"
+        f"Example of a good specific pain point (for a Millwork Shop): '1. Difficulty sourcing AWI Premium Grade veneers consistently for high-spec institutional projects, leading to compliance risks or costly rework.'\n"
+        f"Example of a bad generic pain point: '1. Needs to improve overall project efficiency.'"
+    )
+
+
+def _prompt_messages(static_prompt: str, company_prompt: str) -> list:
+    """Chat messages for one analysis: the shared prefix as the system message, the company as the user turn."""
+    if Config.LLM_PROVIDER == "anthropic":
+        # Anthropic only caches prefixes that are explicitly marked
+        system_content = [{"type": "text", "text": static_prompt, "cache_control": {"type": "ephemeral"}}]
+    else:
+        system_content = static_prompt # OpenAI-style providers cache identical prefixes automatically
+    return [SystemMessage(content=system_content), HumanMessage(content=company_prompt)]
+
+
+def _clean_analysis_result(response) -> str:
+    """Text of an LLM response, trimmed to start at its numbered list."""
+    # Extract content (common attribute for LangChain message responses)
+    analysis_result = response.content if hasattr(response, 'content') else str(response)
+
+    # Ensure the output is just the list, remove any accidental preamble the LLM might add.
+    # A simple way: find the first numbered line. When the reply already starts with the list this
+    # matches at position 0, so no separate prefix check is needed.
+    match = _FIRST_NUMBERED_LINE.search(analysis_result)
+    if match:
+        analysis_result = analysis_result[match.start():]
+    return analysis_result.strip()
+
+
 class PainPointAnalyzerTool(BaseTool):
     name: str = "Company Pain Point Analyzer"
     description: str = ( # Updated description to be more generic
@@ -15,6 +100,25 @@ class PainPointAnalyzerTool(BaseTool):
         "segment configuration, and client profile."
     )
 
+    def _build_prompt(self, company_name: str, segment_config: Mapping, client_profile: Mapping) -> tuple:
+        """
+        Builds the single-company pain point prompt.
+
+        Returns:
+            tuple: (static prefix shared by every company of this segment/client, company-specific tail)
+        """
+        segment_name = segment_config.get("SEGMENT_NAME", "Unknown Segment")
+        client_name = client_profile.get("CLIENT_NAME", "Our Client")
+
+        # --- Extract relevant details for the prompt (one lookup each) ---
+        client_usps_str = "; ".join(client_profile.get("CORE_PRODUCTS_USPS") or _DEFAULT_USPS)
+        segment_pain_examples_str = "; ".join(segment_config.get("SEGMENT_SPECIFIC_PAIN_POINTS_SJ_MORSE_CAN_SOLVE") or _DEFAULT_PAINS)
+        segment_product_focus = segment_config.get("PRODUCT_FOCUS_FOR_SEGMENT") or _DEFAULT_FOCUS
+
+        static_prompt = _static_prompt(client_name, client_usps_str, segment_name, segment_product_focus, segment_pain_examples_str)
+        company_prompt = f"**Company under analysis:** '{company_name}' (Segment: '{segment_name}')"
+        return static_prompt, company_prompt
+
     @handle_api_error # Keep for graceful failure of LLM call
     def _run(self, company_name: str, segment_config: dict, client_profile: dict) -> str:
         """
@@ -30,82 +134,46 @@ class PainPointAnalyzerTool(BaseTool):
         # --- Input Validation ---
         if not all([
             isinstance(company_name, str) and company_name,
-            isinstance(segment_config, dict) and segment_config,
-            isinstance(client_profile, dict) and client_profile
+            isinstance(segment_config, Mapping) and segment_config,
+            isinstance(client_profile, Mapping) and client_profile
         ]):
-            error_msg = f"Invalid input provided: company_name='{company_name}', segment_config is_dict='{isinstance(segment_config, dict)}', client_profile is_dict='{isinstance(client_profile, dict)}'"
+            error_msg = f"Invalid input provided: company_name='{company_name}', segment_config is_dict='{isinstance(segment_config, Mapping)}', client_profile is_dict='{isinstance(client_profile, Mapping)}'"
             logger.error(f"[Tool: {tool_name}] {error_msg}")
             return f"Error: Invalid input provided to PainPointAnalyzerTool. Details: {error_msg}"
 
-        # --- Extract relevant details for the prompt ---
-        client_usps_list = client_profile.get("CORE_PRODUCTS_USPS", ["specialized solutions"])
-        client_usps_str = "; ".join(client_usps_list)
-
-        segment_pain_examples_list = segment_config.get("SEGMENT_SPECIFIC_PAIN_POINTS_SJ_MORSE_CAN_SOLVE", ["their unique challenges"])
-        segment_pain_examples_str = "; ".join(segment_pain_examples_list)
-        
-        segment_product_focus = segment_config.get("PRODUCT_FOCUS_FOR_SEGMENT", "custom solutions")
-
-
-        # --- Construct the new, specific prompt ---
-        # You can add a SystemMessage here too if desired, e.g.,
-        # messages = [
-        #     SystemMessage(content=f"You are a business analyst for {client_name}, specializing in identifying client needs for custom architectural wood veneer panels."),
-        #     HumanMessage(content=prompt_text)
-        # ]
-        # For simplicity, we'll use a detailed HumanMessage.
-
-        prompt_text = (
-            f"**You are a specialized business consultant for {client_name}.**\n"
-            f"{client_name} is a premium US-based manufacturer of custom architectural wood veneer panels. "
-            f"Key strengths: {client_usps_str}.\n\n"
-            f"**Company Profile for Analysis:**\n"
-            f"- Name: '{company_name}'\n"
-            f"- Segment: '{segment_name}'\n"
-            f"- Likely Needs related to Architectural Veneer: {segment_product_focus}. Based on their segment, they often encounter issues such as: {segment_pain_examples_str}.\n\n"
-            f"**Your Objective:**\n"
-            f"Identify exactly 3 to 5 **highly specific and distinct** business pain points OR unmet needs for '{company_name}' that {client_name} can directly solve with their custom architectural wood veneer panels and associated services. "
-            f"Each pain point should clearly imply why '{company_name}' would benefit from partnering with a specialized, high-quality veneer supplier like {client_name}.\n\n"
-            f"**CRITICAL GUIDELINES for Pain Points:**\n"
-            f"1.  **Specificity is Key:** Focus on practical, operational, project-specific, or quality-control challenges related to specifying, sourcing, or installing wood veneer. "
-            f"For example, instead of 'improve quality,' specify 'risk of using non-AWI compliant veneers leading to project rejection.'\n"
-            f"2.  **Directly Solvable by {client_name}:** Each point MUST be something {client_name}'s products/services (like AWI Premium Grade, custom capabilities, cut-to-size, reliable delivery) can address.\n"
-            f"3.  **Avoid Generic Business Advice:** DO NOT list high-level, generic issues like 'increase profits,' 'reduce costs,' 'improve marketing,' 'find more customers,' or 'manage competition' UNLESS you can tie it *extremely specifically* to a veneer-related problem that {client_name} solves. (e.g., 'High material waste and labor costs due to inaccurately sized veneer panels' is acceptable because cut-to-size services address it).\n"
-            f"4.  **Imply a \"Why Now?\" or \"Why Us?\":** The pain should be significant enough to warrant considering a new or specialized supplier like {client_name}.\n" # Note: Escaped quotes around "Why Now?"
-            f"5.  **Distinct Points:** Ensure each of the 3-5 points is different and not just a rephrasing of another.\n\n"
-            f"**Output Format:**\n"
-            f"Provide ONLY a concise, numbered list of these 3-5 pain points/needs. "
-            f"NO introductory sentences, NO concluding remarks, NO explanations beyond the points themselves. Start directly with '1.'\n\n"
-            f"Example of a good specific pain point (for a Millwork Shop): '1. Difficulty sourcing AWI Premium Grade veneers consistently for high-spec institutional projects, leading to compliance risks or costly rework.'\n"
-            f"Example of a bad generic pain point: '1. Needs to improve overall project efficiency.'"
-        )
-
-        logger.debug(f"[Tool: {tool_name}] Constructed prompt for '{company_name}':\n{prompt_text}")
+        static_prompt, company_prompt = self._build_prompt(company_name, segment_config, client_profile)
+
+        logger.debug(f"[Tool: {tool_name}] Constructed prompt for '{company_name}':\n{static_prompt}\n\n{company_prompt}")
+
+        cache_key = _analysis_cache_key(f"{static_prompt}\n\n{company_prompt}")
+        cached_result = _analysis_cache.get(cache_key)
+        with _analysis_cache_stats_lock:
+            _analysis_cache_stats["hits" if cached_result is not None else "misses"] += 1
+            hits, misses = _analysis_cache_stats["hits"], _analysis_cache_stats["misses"]
+        if cached_result is not None:
+            logger.info("[Tool: %s] Reusing cached analysis for '%s' (cache hits: %s, misses: %s).",
+                        tool_name, company_name, hits, misses)
+            return cached_result
 
         try:
             logger.debug(f"[Tool: {tool_name}] Getting LLM instance from factory...")
-            llm = get_llm_instance()
+            llm = get_llm_instance(purpose="pain_point")
             if llm is None:
                 logger.error(f"[Tool: {tool_name}] Failed to get LLM instance.")
                 return "Error: LLM instance could not be initialized for pain point analysis."
             logger.debug(f"[Tool: {tool_name}] Using LLM instance type: {type(llm).__name__}")
 
             logger.debug(f"[Tool: {tool_name}] Making LLM call for '{company_name}'...")
-            response = llm.invoke([HumanMessage(content=prompt_text)])
+            response = llm.invoke(_prompt_messages(static_prompt, company_prompt))
             
-            # Extract content (common attribute for LangChain message responses)
-            analysis_result = response.content if hasattr(response, 'content') else str(response)
+            analysis_result = _clean_analysis_result(response)
 
             logger.info(f"[Tool: {tool_name}] LLM call successful for '{company_name}'.")
             logger.debug(f"[Tool: {tool_name}] LLM Response for '{company_name}':\n{analysis_result}")
             
-            # Ensure the output is just the list, remove any accidental preamble the LLM might add.
-            # A simple way: find the first digit if it's a numbered list.
-            match = re.search(r"^\s*\d\.", analysis_result, re.MULTILINE)
-            if match:
-                analysis_result = analysis_result[match.start():]
-            
-            return analysis_result.strip()
+            if analysis_result: # Only real answers are cached; errors and empty replies are retried next time
+                _analysis_cache.set(cache_key, analysis_result)
+            return analysis_result
 
         except Exception as e:
             logger.error(f"[Tool: {tool_name}] LLM call failed for '{company_name}': {e}", exc_info=True)
@@ -115,3 +183,35 @@ class PainPointAnalyzerTool(BaseTool):
 
 # Instantiate the tool (remains the same)
 analyze_pain_points_tool = PainPointAnalyzerTool()
+
+
+class ParallelAnalysisTool(BaseTool):
+    name: str = "Company Contact and Pain Point Analyzer"
+    description: str = (
+        "Finds a company's general contact email and analyzes its pain points in one call. "
+        "Input must be the company name, the company website URL, segment configuration, and client profile. "
+        "Returns a 'Contact Email:' line followed by 'Pain Points:' and a numbered list."
+    )
+
+    def _run(self, company_name: str, website: str, segment_config: dict, client_profile: dict) -> str:
+        """
+        Runs the email finder and the pain point analyzer at the same time and merges their results.
+
+        The two lookups are independent (one scrapes the website, the other asks the LLM), so running
+        them on two threads makes the analysis take as long as the slower one instead of both combined,
+        and the agent needs one tool call instead of two.
+        """
+        logger.info("[Tool: %s] Executing for Company: '%s' (%s)", self.name, company_name, website)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            email_future = pool.submit(unified_email_finder_tool.run, company_url=website)
+            pain_points_future = pool.submit(analyze_pain_points_tool.run, company_name=company_name,
+                                             segment_config=segment_config, client_profile=client_profile)
+            # Both tools already turn their own failures into "" / "Error: ..." strings
+            email = email_future.result()
+            pain_points = pain_points_future.result()
+
+        if not email or email.startswith("Error"):
+            email = "Email not found."
+        return f"Contact Email: {email}\nPain Points:\n{pain_points}"
+
+parallel_analysis_tool = ParallelAnalysisTool()
@@ -1,22 +1,297 @@
 # tools/scraper_tools.py
 
 # --- Standard Library Imports ---
+import json
 import logging
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin, urlparse
 
 # --- Third-party Imports ---
 import requests
-from bs4 import BeautifulSoup, Tag # Import Tag
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup
+from lxml import etree
+try:
+    from selectolax.lexbor import LexborHTMLParser # Optional: much faster C parser for the HTML scans below
+except ImportError:
+    LexborHTMLParser = None
 
 # --- CrewAI Imports ---
 from crewai.tools import BaseTool
 
+# --- Local Imports ---
+from config import Config
+from utils.api_cache import DiskCache
+
 # --- Logger Setup ---
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# --- Request Headers (built once, shared by every tool call) ---
+_BLOG_REQUEST_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
+_BROWSER_REQUEST_HEADERS = { 'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15', 'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8', 'Accept-Language': 'en-US,en;q=0.5', 'Referer': 'https://www.google.com/', 'DNT': '1', 'Connection': 'keep-alive', 'Upgrade-Insecure-Requests': '1', 'Sec-Fetch-Dest': 'document', 'Sec-Fetch-Mode': 'navigate', 'Sec-Fetch-Site': 'cross-site', 'Sec-Fetch-User': '?1', 'TE': 'trailers'}
+
+
+def new_http_session(headers: dict, retries: int = 2) -> requests.Session:
+    """
+    Builds a requests Session with pooled keep-alive connections and a short retry on gateway errors.
+
+    Args:
+        headers: Default headers sent with every request
+        retries: Retries on 502/503/504 responses (0 when the caller already retries)
+
+    Returns:
+        requests.Session: Session whose repeat requests to a host reuse the TCP/TLS connection
+    """
+    session = requests.Session()
+    session.headers.update(headers)
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64,
+                          max_retries=Retry(total=retries, backoff_factor=0.3, status_forcelist=[502, 503, 504]))
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+# Shared by all blog scrapes (including the batch tool's threads)
+_BLOG_SESSION = new_http_session(_BLOG_REQUEST_HEADERS)
+# Shared by the contact page finder and generic scraper, so repeat fetches from a host reuse the connection
+_BROWSER_SESSION = new_http_session(_BROWSER_REQUEST_HEADERS)
+_BLOG_REQUEST_TIMEOUT = (5, 20) # (connect, read) seconds
+# Blog bodies are streamed and cut off here; list headings sit far earlier, the tail is mostly scripts/comments
+_BLOG_MAX_BYTES = 1_000_000
+_STREAM_CHUNK_SIZE = 64 * 1024
+# Same idea for the browser-session tools: homepages keep their footer links, while the generic
+# scraper only returns 10,000 characters of text anyway
+_CONTACT_PAGE_MAX_BYTES = 1_000_000
+_TEXT_PAGE_MAX_BYTES = 512_000
+
+# --- Scrape Result Cache ---
+# Successful scrape results keyed by (tool, URL); reruns and repeat URLs skip the fetch and parse.
+# None unless Config.SCRAPER_CACHE_PATH is set.
+_SCRAPE_CACHE = (DiskCache(Config.SCRAPER_CACHE_PATH, ttl_seconds=Config.SCRAPER_CACHE_TTL_HOURS * 3600)
+                 if Config.SCRAPER_CACHE_PATH else None)
+if _SCRAPE_CACHE is not None:
+    logger.warning("Scraper cache enabled: reusing page results up to %s hours old from %s (unset SCRAPER_CACHE_PATH for a fresh crawl).",
+                   Config.SCRAPER_CACHE_TTL_HOURS, Config.SCRAPER_CACHE_PATH)
+
+# --- Page Text Limits ---
+_PAGE_TEXT_MAX_CHARS = 10_000 # Text returned per page by the generic scraper
+# A batch tool result holds all its pages, so they share this budget (~6k tokens once JSON-escaped),
+# which leaves room in a 16k-context model for the prompt, scratchpad and answer
+BATCH_SCRAPE_CHAR_BUDGET = 24_000
+_BATCH_PAGE_MIN_CHARS = 3_000 # Less text than this per page is too little to find companies in
+MAX_BATCH_SCRAPE_URLS = BATCH_SCRAPE_CHAR_BUDGET // _BATCH_PAGE_MIN_CHARS # 8
+
+# --- Blog Post Parsing Patterns (compiled once) ---
+_CONTENT_WRAPPER_RE = re.compile(r'content-wrapper', re.IGNORECASE)
+_LEADING_NUMBER_RE = re.compile(r'^\d+\.?\s*') # "3. Acme" -> "Acme"
+# Substring match, like the old `any(term in name.lower() ...)` scan over the ignore list
+_IGNORED_HEADING_RE = re.compile(r'conclusion|introduction|key takeaways|faq', re.IGNORECASE)
+# --- Contact Page Link Keywords ---
+# Most relevant first; a link's priority is the index of the first keyword it matches
+_CONTACT_KEYWORDS_PRIORITY = ('contact us', 'contact-us', 'contact', 'kontakt', 'contacto', 'get in touch', 'reach us', 'support', 'hilfe', 'soporte', 'customer service', 'about us', 'about-us', 'about', 'über uns', 'sobre nosotros', 'company', 'locations', 'standorte', 'imprint', 'impressum', 'legal notice', 'legal', 'privacy', 'terms')
+# (keyword, space/hyphen-free form) pairs, in priority order
+_CONTACT_KEYWORD_FORMS = tuple((keyword, keyword.replace(' ', '').replace('-', '')) for keyword in _CONTACT_KEYWORDS_PRIORITY)
+# Every keyword form in one alternation: a link whose "path\x00text" has no hit
+# cannot match any keyword, so it skips the per-keyword priority scan
+_CONTACT_KEYWORD_HINT_RE = re.compile('|'.join(re.escape(form) for form in sorted(
+    {form for forms in _CONTACT_KEYWORD_FORMS for form in forms}, key=len, reverse=True)))
+# --- Generic Page Text (lxml fallback path, compiled once) ---
+# Checked in this order, like the old find('main') or find('article') or find('div', role='main')
+_MAIN_CONTENT_XPATHS = (etree.XPath('(//main)[1]'), etree.XPath('(//article)[1]'), etree.XPath("(//div[@role='main'])[1]"))
+_BODY_XPATH = etree.XPath('(//body)[1]')
+_HEADING_JUNK_TABLE = str.maketrans('', '', '®*™©') # Markup/trademark glyphs dropped in one pass
+
+
+def _scrape_in_parallel(scrape, urls, max_workers: int) -> dict:
+    """
+    Runs a single-URL scrape function over several URLs on a thread pool.
+
+    The scrapers are network-bound, so threads overlap the request latency; each scrape
+    function already turns its own failures into an "Error: ..." string.
+
+    Args:
+        scrape: Callable taking one URL and returning its result string
+        urls: URLs to scrape (duplicates are fetched once)
+        max_workers: Upper bound on concurrent fetches
+
+    Returns:
+        dict: URL -> result string, in the order the URLs were given
+    """
+    unique_urls = list(dict.fromkeys(urls))
+    if not unique_urls:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(unique_urls)))) as pool:
+        return dict(zip(unique_urls, pool.map(scrape, unique_urls)))
+
+
+def read_capped_text(response: requests.Response, max_bytes: int) -> str:
+    """
+    Reads a streamed response body up to max_bytes, closes the response and decodes the body.
+
+    Stops pulling chunks as soon as the cap is reached, so oversized pages are not downloaded
+    in full; a cut multi-byte character at the end is replaced rather than raising.
+
+    Args:
+        response: Response opened with stream=True
+        max_bytes: Maximum number of body bytes to read
+
+    Returns:
+        str: The (possibly truncated) body text
+    """
+    chunks = []
+    total = 0
+    for chunk in response.iter_content(_STREAM_CHUNK_SIZE):
+        chunks.append(chunk)
+        total += len(chunk)
+        if total >= max_bytes:
+            logger.debug("Stopped reading %s after %s bytes.", response.url, total)
+            break
+    response.close() # Drops the connection if a tail was left unread; a fully read one goes back to the pool
+    return b''.join(chunks)[:max_bytes].decode(response.encoding or 'utf-8', errors='replace')
+
+
+def _usable_blog_link(href, page_url: str):
+    """
+    Resolves a link found under a blog heading, skipping ones that cannot be a company website.
+
+    Args:
+        href: Raw href attribute value (may be None)
+        page_url: URL of the blog post, used to resolve relative links
+
+    Returns:
+        str: Absolute URL, or None for in-page anchors, mailto:/tel:/javascript: links and other schemes
+    """
+    if not href or urlparse(href).scheme not in ('http', 'https', ''):
+        return None
+    if '#' in href.split('/')[-1] or href.startswith(('mailto:', 'tel:', 'javascript:')):
+        return None
+    return urljoin(page_url, href)
+
+
+def _group_links_under_headings(nodes, page_url: str) -> list:
+    """
+    Single pass over a post's H3 headings and links, in document order.
+
+    Each usable H3 starts a company entry; the first usable link after it (inside the heading
+    or anywhere before the next H3) becomes that company's link. Ignored headings still end
+    the previous company's section.
+
+    Args:
+        nodes: Iterable of ('h3', heading text) / ('a', href) pairs in document order
+        page_url: URL of the blog post, used to resolve relative links
+
+    Returns:
+        list: {"name", "link"} dicts, one per usable heading
+    """
+    companies_found = []
+    current = None
+    for tag, value in nodes:
+        if tag == 'h3':
+            company_name = _LEADING_NUMBER_RE.sub('', value).translate(_HEADING_JUNK_TABLE).strip()
+            if len(company_name) < 3 or _IGNORED_HEADING_RE.search(company_name):
+                logger.debug("[T: Blog Post Company Scraper] Ignoring H3: '%s'", company_name)
+                current = None
+                continue
+            current = {"name": company_name, "link": "Link not found"}
+            companies_found.append(current)
+        elif current is not None and current["link"] == "Link not found":
+            link_url = _usable_blog_link(value, page_url)
+            if link_url:
+                current["link"] = link_url
+    return companies_found
+
+
+def _scan_blog_headings_lexbor(html: str, url: str):
+    """
+    Finds the H3 company headings (and the link after each) with selectolax.
+
+    Uses the same content-area preference as the BeautifulSoup path in BlogPostScraperTool.
+
+    Args:
+        html: Page HTML
+        url: Page URL, used to resolve relative links
+
+    Returns:
+        list: {"name", "link"} dicts, or None if the page could not be parsed (caller falls back to bs4)
+    """
+    try:
+        tree = LexborHTMLParser(html)
+        content_area = (tree.css_first('div.blog-post_content-wrapper') or tree.css_first('div[class*="content-wrapper" i]')
+                        or tree.css_first('article') or tree.css_first('main') or tree.body or tree.root)
+        if content_area is None:
+            return None
+        # One selector pass; lexbor returns matches in document order
+        nodes = [(node.tag, node.text(strip=True) if node.tag == 'h3' else node.attributes.get('href'))
+                 for node in content_area.css('h3, a[href]')]
+        logger.info("[T: Blog Post Company Scraper] Found %s H3s.", sum(1 for tag, _ in nodes if tag == 'h3'))
+        return _group_links_under_headings(nodes, url)
+    except Exception as e:
+        logger.debug("[T: Blog Post Company Scraper] selectolax scan failed for %s, using BeautifulSoup: %s", url, e)
+        return None
+
+
+def _section_links(section, lexbor: bool) -> list:
+    """(href, link text) for every anchor with an href in a parsed page section."""
+    if lexbor:
+        return [(node.attributes.get('href'), node.text(strip=True)) for node in section.css('a[href]')]
+    return [(link['href'], link.get_text(strip=True)) for link in section.find_all('a', href=True)]
+
+
+def _contact_link_sections(html: str) -> tuple:
+    """
+    Collects the anchors of a homepage's footer, nav/header and whole body.
+
+    Uses selectolax when available and BeautifulSoup otherwise.
+
+    Args:
+        html: Page HTML
+
+    Returns:
+        tuple: (footer links, nav/header links, body links); the first two are None when the page has no such element
+    """
+    if LexborHTMLParser is not None:
+        tree = LexborHTMLParser(html)
+        footer, nav_or_header, page_body = tree.css_first('footer'), tree.css_first('nav') or tree.css_first('header'), tree.body or tree.root
+        lexbor = True
+    else:
+        soup = BeautifulSoup(html, 'lxml')
+        footer, nav_or_header, page_body = soup.find('footer'), soup.find('nav') or soup.find('header'), soup.body if soup.body else soup
+        lexbor = False
+    return (_section_links(footer, lexbor) if footer else None,
+            _section_links(nav_or_header, lexbor) if nav_or_header else None,
+            _section_links(page_body, lexbor))
+
+
+def _extract_page_text(html: str) -> tuple:
+    """
+    Visible text of a page's main content area (main, article or div[role=main]), or of the body.
+
+    Scripts and styles are removed first. Uses selectolax when available and lxml otherwise; the
+    lxml parser drops comments while parsing and strips script/style subtrees in C.
+
+    Args:
+        html: Page HTML
+
+    Returns:
+        tuple: (text, True if a main content area was found)
+    """
+    if LexborHTMLParser is not None:
+        tree = LexborHTMLParser(html)
+        for node in tree.css('script, style'): node.decompose()
+        main_content = tree.css_first('main') or tree.css_first('article') or tree.css_first('div[role="main"]')
+        if main_content: return main_content.text(separator=' ', strip=True), True
+        return (tree.body.text(separator=' ', strip=True) if tree.body else ""), False
+    root = etree.fromstring(html.encode('utf-8'), etree.HTMLParser(encoding='utf-8', remove_comments=True, remove_pis=True))
+    if root is None: return "", False
+    etree.strip_elements(root, 'script', 'style', with_tail=False)
+    for xpath in _MAIN_CONTENT_XPATHS:
+        main_content = xpath(root)
+        if main_content: return ' '.join(text for text in map(str.strip, main_content[0].itertext()) if text), True
+    body = _BODY_XPATH(root)
+    return (' '.join(text for text in map(str.strip, body[0].itertext()) if text) if body else ""), False
+
 
 # ==================================
 # === Tool 1: Blog Post Scraper ===
@@ -27,35 +302,32 @@ class BlogPostScraperTool(BaseTool):
     def _run(self, url: str) -> str:
         logger.info(f"[Tool: {self.name}] Executing for URL: {url}")
         if not isinstance(url, str) or not url.startswith(('http://', 'https://')): logger.error(f"[T: {self.name}] Invalid URL: {url}"); return "Error: Invalid URL provided."
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
-        companies_found = []
+        cache_key = DiskCache.make_key(self.name, url)
+        cached = _SCRAPE_CACHE.get(cache_key) if _SCRAPE_CACHE is not None else None
+        if cached is not None: logger.info(f"[Tool: {self.name}] Using cached result for {url}"); return cached
         try:
-            response = requests.get(url, headers=headers, timeout=20); response.raise_for_status(); soup = BeautifulSoup(response.text, 'lxml')
-            content_area = soup.find('div', class_='blog-post_content-wrapper') or soup.find('div', class_=re.compile(r'content-wrapper', re.IGNORECASE)) or soup.find('article') or soup.find('main') or soup.body or soup
-            if not content_area: logger.error(f"[T: {self.name}] No content area: {url}"); return "Error: Could not identify main content area."
-            headings = content_area.find_all('h3'); logger.info(f"[T: {self.name}] Found {len(headings)} H3s.")
-            for i, heading in enumerate(headings):
-                company_name = heading.get_text(strip=True); company_name = re.sub(r'^\d+\.?\s*', '', company_name).strip().replace('®', '').replace('*', '')
-                ignore_list = ["conclusion", "introduction", "key takeaways", "faq", "faqs"];
-                if len(company_name) < 3 or any(ignore_term in company_name.lower() for ignore_term in ignore_list): logger.debug(f"[T: {self.name}] Ignoring H3: '{company_name}'"); continue
-                link_url = "Link not found"; current_element = heading
-                while True:
-                    next_sibling = current_element.find_next_sibling();
-                    if next_sibling is None: break
-                    if isinstance(next_sibling, Tag):
-                        if next_sibling == headings[i+1] if (i + 1) < len(headings) else None: break
-                        link_tag = next_sibling.find('a', href=True)
-                        if link_tag: href = link_tag.get('href');
-                        if href and urlparse(href).scheme in ['http', 'https', '']:
-                            if '#' not in href.split('/')[-1] and not href.startswith(('mailto:', 'tel:', 'javascript:')):
-                                absolute_link = urljoin(url, href); link_url = absolute_link; logger.debug(f"[T: {self.name}] Found link '{link_url}' for '{company_name}'"); break
-                    current_element = next_sibling
-                companies_found.append({"name": company_name, "link": link_url}); logger.debug(f"[T: {self.name}] Potential match: {company_name} ({link_url})")
+            with _BLOG_SESSION.get(url, timeout=_BLOG_REQUEST_TIMEOUT, stream=True) as response: # Closing drops any unread tail
+                response.raise_for_status()
+                html = read_capped_text(response, _BLOG_MAX_BYTES)
+            companies_found = _scan_blog_headings_lexbor(html, url) if LexborHTMLParser is not None else None
+            if companies_found is None: # selectolax not installed, or it could not handle this page
+                soup = BeautifulSoup(html, 'lxml')
+                content_area = soup.find('div', class_='blog-post_content-wrapper') or soup.find('div', class_=_CONTENT_WRAPPER_RE) or soup.find('article') or soup.find('main') or soup.body or soup
+                if not content_area:
+                    logger.error(f"[T: {self.name}] No content area: {url}")
+                    return "Error: Could not identify main content area."
+                # find_all with both names walks the content area once, in document order
+                nodes = [(node.name, node.get_text(strip=True) if node.name == 'h3' else node.get('href'))
+                         for node in content_area.find_all(['h3', 'a'])]
+                logger.info(f"[T: {self.name}] Found {sum(1 for tag, _ in nodes if tag == 'h3')} H3s.")
+                companies_found = _group_links_under_headings(nodes, url)
             if not companies_found: logger.warning(f"[T: {self.name}] No companies in H3s: {url}"); return f"No potential companies identified in H3 headings on {url}."
             output_lines = ["Found Companies:"];
             for company in companies_found: output_lines.append(f"- {company['name']} ({company['link']})")
             logger.info(f"[Tool: {self.name}] Finished scraping. Found {len(companies_found)} entries.")
-            return "\n".join(output_lines)
+            result = "\n".join(output_lines)
+            if _SCRAPE_CACHE is not None: _SCRAPE_CACHE.set(cache_key, result) # Only successful scrapes are cached
+            return result
         except requests.exceptions.RequestException as e: logger.error(f"[T: {self.name}] Request Fail: {url}: {e}"); return f"Error: Request failed for {url}."
         except Exception as e: logger.error(f"[T: {self.name}] Unexpected Error: {url}: {e}", exc_info=True); return "Error: An unexpected error occurred during blog scraping."
 
@@ -69,38 +341,38 @@ scrape_blog_tool = BlogPostScraperTool()
 class ContactPageUrlFinderTool(BaseTool):
     name: str = "Contact/About Page URL Finder"
     description: str = ("Given a company's website URL, attempts to find the absolute URL of their 'Contact Us', 'About Us', or 'Support' page...") # Shortened
-    def _search_links(self, soup_section, effective_url) -> dict:
-        keywords_priority = ['contact us', 'contact-us', 'contact', 'kontakt', 'contacto', 'get in touch', 'reach us', 'support', 'hilfe', 'soporte', 'customer service', 'about us', 'about-us', 'about', 'über uns', 'sobre nosotros', 'company', 'locations', 'standorte', 'imprint', 'impressum', 'legal notice', 'legal', 'privacy', 'terms']; found_links = {}
-        for link in soup_section.find_all('a', href=True):
-            link_text = link.get_text(strip=True).lower(); href = link['href']
+    def _search_links(self, links, effective_url) -> dict:
+        found_links = {}; page_url = effective_url.rstrip('/')
+        for href, link_text in links:
+            link_text = link_text.lower()
             if not href or href.startswith(('#', 'javascript:', 'mailto:', 'tel:')): continue
             absolute_url = urljoin(effective_url, href)
-            if absolute_url.rstrip('/') == effective_url.rstrip('/'): continue
+            if absolute_url.rstrip('/') == page_url: continue
             if absolute_url in found_links: continue
-            for i, keyword in enumerate(keywords_priority):
-                href_path = urlparse(absolute_url).path.lower(); href_parts = [p for p in href_path.split('/') if p]; keyword_simple = keyword.replace(' ', '').replace('-', '')
-                is_in_href = False
-                if href_parts:
-                    if keyword in href_parts or keyword_simple in href_parts: is_in_href = True
-                    elif keyword in href_parts[-1] or keyword_simple in href_parts[-1]: is_in_href = True
-                is_in_text = keyword in link_text
-                if is_in_href or is_in_text:
-                    if absolute_url not in found_links or i < found_links[absolute_url]: found_links[absolute_url] = i; logger.debug(f"[T: {self.name}] Found link {absolute_url} (K: '{keyword}', P: {i})")
+            href_path = urlparse(absolute_url).path.lower() # Keyword-independent, so parsed once per link
+            if not _CONTACT_KEYWORD_HINT_RE.search(f"{href_path}\x00{link_text}"): continue # No keyword anywhere
+            href_parts = [p for p in href_path.split('/') if p]
+            part_set = frozenset(href_parts); last_part = href_parts[-1] if href_parts else ''
+            for i, (keyword, keyword_simple) in enumerate(_CONTACT_KEYWORD_FORMS):
+                is_in_href = keyword in part_set or keyword_simple in part_set or keyword in last_part or keyword_simple in last_part
+                if is_in_href or keyword in link_text:
+                    found_links[absolute_url] = i; logger.debug(f"[T: {self.name}] Found link {absolute_url} (K: '{keyword}', P: {i})")
                     break
         return found_links
     def _run(self, company_url: str) -> str:
         logger.info(f"[Tool: {self.name}] Executing for URL: {company_url}")
         if not isinstance(company_url, str) or not urlparse(company_url).scheme in ['http', 'https']: logger.error(f"[T: {self.name}] Invalid URL: {company_url}"); return "Error: Invalid company URL"
-        headers = { 'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15', 'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8', 'Accept-Language': 'en-US,en;q=0.5', 'Referer': 'https://www.google.com/', 'DNT': '1', 'Connection': 'keep-alive', 'Upgrade-Insecure-Requests': '1', 'Sec-Fetch-Dest': 'document', 'Sec-Fetch-Mode': 'navigate', 'Sec-Fetch-Site': 'cross-site', 'Sec-Fetch-User': '?1', 'TE': 'trailers'}
         result = "Relevant page not found"
         try:
             logger.debug(f"[Tool: {self.name}] Fetching homepage: {company_url}")
-            response = requests.get(company_url, headers=headers, timeout=20, allow_redirects=True); response.raise_for_status(); effective_url = response.url
-            content_type = response.headers.get('Content-Type', '').lower()
-            if 'text/html' not in content_type: logger.warning(f"[T: {self.name}] Homepage Non-HTML: {effective_url} ({content_type})"); return f"Error: Homepage Non-HTML ({content_type})"
-            soup = BeautifulSoup(response.text, 'lxml'); page_body = soup.body if soup.body else soup
+            with _BROWSER_SESSION.get(company_url, timeout=20, allow_redirects=True, stream=True) as response: # Released on every exit, HTTP errors included
+                response.raise_for_status(); effective_url = response.url
+                content_type = response.headers.get('Content-Type', '').lower()
+                if 'text/html' not in content_type: logger.warning(f"[T: {self.name}] Homepage Non-HTML: {effective_url} ({content_type})"); return f"Error: Homepage Non-HTML ({content_type})"
+                html = read_capped_text(response, _CONTACT_PAGE_MAX_BYTES)
+            footer, nav_or_header, page_body = _contact_link_sections(html)
             logger.info(f"[Tool: {self.name}] Searching for contact/about page links...")
-            found_links = {}; footer = soup.find('footer'); nav_or_header = soup.find('nav') or soup.find('header')
+            found_links = {}
             if footer: logger.debug(f"[T: {self.name}] Searching links in footer..."); found_links.update(self._search_links(footer, effective_url))
             if not any(p <= 16 for p in found_links.values()):
                  if nav_or_header: logger.debug(f"[T: {self.name}] Searching links in nav/header..."); header_links = self._search_links(nav_or_header, effective_url); found_links.update(header_links)
@@ -128,19 +400,22 @@ class GenericWebScraperTool(BaseTool):
     def _run(self, url: str) -> str:
         logger.info(f"[Tool: {self.name}] Executing for URL: {url}")
         if not isinstance(url, str) or not urlparse(url).scheme in ['http', 'https']: logger.error(f"[T: {self.name}] Invalid URL: {url}"); return "Error: Invalid URL provided."
-        headers = { 'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15', 'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8', 'Accept-Language': 'en-US,en;q=0.5', 'Referer': 'https://www.google.com/', 'DNT': '1', 'Connection': 'keep-alive', 'Upgrade-Insecure-Requests': '1', 'Sec-Fetch-Dest': 'document', 'Sec-Fetch-Mode': 'navigate', 'Sec-Fetch-Site': 'cross-site', 'Sec-Fetch-User': '?1', 'TE': 'trailers'}
+        cache_key = DiskCache.make_key(self.name, url)
+        cached = _SCRAPE_CACHE.get(cache_key) if _SCRAPE_CACHE is not None else None
+        if cached is not None: logger.info(f"[Tool: {self.name}] Using cached text for {url}"); return cached
         try:
-            response = requests.get(url, headers=headers, timeout=25, allow_redirects=True); response.raise_for_status(); effective_url = response.url
-            content_type = response.headers.get('Content-Type', '').lower()
-            if 'text/html' not in content_type: logger.warning(f"[T: {self.name}] Non-HTML: {effective_url} ({content_type})"); return f"Error: Non-HTML content ({content_type})"
-            soup = BeautifulSoup(response.text, 'lxml');
-            for script_or_style in soup(["script", "style"]): script_or_style.decompose()
-            main_content = soup.find('main') or soup.find('article') or soup.find('div', role='main')
-            if main_content: text = main_content.get_text(separator=' ', strip=True); logger.info(f"[T: {self.name}] Extracted main text for {url}.")
-            else: text = soup.body.get_text(separator=' ', strip=True) if soup.body else ""; logger.info(f"[T: {self.name}] Extracted body text (fallback) for {url}.")
-            text = re.sub(r'\s{2,}', ' ', text).strip(); max_chars = 10000
+            with _BROWSER_SESSION.get(url, timeout=25, allow_redirects=True, stream=True) as response: # Released on every exit, HTTP errors included
+                response.raise_for_status(); effective_url = response.url
+                content_type = response.headers.get('Content-Type', '').lower()
+                if 'text/html' not in content_type: logger.warning(f"[T: {self.name}] Non-HTML: {effective_url} ({content_type})"); return f"Error: Non-HTML content ({content_type})"
+                html = read_capped_text(response, _TEXT_PAGE_MAX_BYTES)
+            text, from_main = _extract_page_text(html)
+            if from_main: logger.info(f"[T: {self.name}] Extracted main text for {url}.")
+            else: logger.info(f"[T: {self.name}] Extracted body text (fallback) for {url}.")
+            text = re.sub(r'\s{2,}', ' ', text).strip(); max_chars = _PAGE_TEXT_MAX_CHARS
             if len(text) > max_chars: logger.warning(f"[T: {self.name}] Truncating text from {url}."); text = text[:max_chars] + "..."
             if not text: logger.warning(f"[T: {self.name}] No text extracted from {url}"); return "Error: No text content found"
+            if _SCRAPE_CACHE is not None: _SCRAPE_CACHE.set(cache_key, text)
             return text
         except requests.exceptions.Timeout: logger.error(f"[T: {self.name}] Timeout: {url}"); return "Error: Timeout accessing URL"
         except requests.exceptions.HTTPError as e: logger.error(f"[T: {self.name}] HTTP {e.response.status_code}: {url}"); return f"Error: HTTP {e.response.status_code}"
@@ -149,3 +424,30 @@ class GenericWebScraperTool(BaseTool):
 
 # --- Instantiate Tool 3 ---
 generic_scraper_tool = GenericWebScraperTool()
+
+
+# ========================================================
+# === Tool 4: Batch Generic Web Content Scraper ===
+# ========================================================
+class BatchGenericScraperTool(BaseTool):
+    name: str = "Batch Generic Web Content Scraper"
+    description: str = ("Fetches the main text content of several web pages in one call. Input `urls` is a list of "
+                        f"up to {MAX_BATCH_SCRAPE_URLS} URLs; returns a JSON object mapping each URL to its page text "
+                        "(or an 'Error: ...' string for pages that could not be fetched).")
+    def _run(self, urls: list[str]) -> str:
+        if isinstance(urls, str): urls = [urls] # Tolerate a single URL passed by the agent
+        logger.info("[Tool: %s] Executing for %s URLs.", self.name, len(urls))
+        if not urls: return "Error: No URLs provided."
+        if len(urls) > MAX_BATCH_SCRAPE_URLS:
+            logger.warning("[T: %s] %s URLs requested; scraping the first %s.", self.name, len(urls), MAX_BATCH_SCRAPE_URLS)
+            urls = urls[:MAX_BATCH_SCRAPE_URLS]
+        results = _scrape_in_parallel(generic_scraper_tool._run, urls, Config.SCRAPER_MAX_CONCURRENCY)
+        # Pages split the batch budget, so the whole result stays within BATCH_SCRAPE_CHAR_BUDGET
+        page_chars = min(_PAGE_TEXT_MAX_CHARS, BATCH_SCRAPE_CHAR_BUDGET // len(results))
+        for url, text in results.items():
+            if len(text) > page_chars: results[url] = text[:page_chars] + "..."
+        logger.info("[Tool: %s] Finished scraping %s URLs (up to %s chars each).", self.name, len(results), page_chars)
+        return json.dumps(results, ensure_ascii=False)
+
+# --- Instantiate Tool 4 ---
+batch_generic_scraper_tool = BatchGenericScraperTool()
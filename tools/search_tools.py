@@ -1,18 +1,17 @@
 # tools/search_tools.py
 
-import os
 import logging
 from crewai.tools import BaseTool
 from crewai_tools import SerperDevTool
+from config import Config # SERPER_API_KEY is read once from the environment snapshot
 # Configure logger
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 # --- Initialize the SerperDevTool ---
 # The tool automatically uses the SERPER_API_KEY environment variable
 try:
     # Check if the API key is present
-    if not os.getenv("SERPER_API_KEY"):
+    if not Config.SERPER_API_KEY:
         raise ValueError("SERPER_API_KEY environment variable not found!")
 
     # Instantiate the tool provided by crewai_tools
@@ -1,18 +1,164 @@
 # tools/unified_email_finder.py
 import re
 import logging
+import functools
+import threading
 import time
-import random
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin, urlparse
 import requests
 from bs4 import BeautifulSoup
+try:
+    from selectolax.lexbor import LexborHTMLParser # Optional: much faster C parser for page scans
+except ImportError:
+    LexborHTMLParser = None
 from crewai.tools import BaseTool
 from utils.error_handler import retry, handle_api_error
+from tools.scraper_tools import new_http_session, read_capped_text
 
 # Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Request headers (module level so the shared session below can use them too)
+_REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Referer': 'https://www.google.com/',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+# Contact pages fetched (concurrently) per company after the homepage
+_MAX_CONTACT_PAGES = 3
+# Page bodies are streamed and cut off here; footer emails on normal pages sit well within it
+_MAX_PAGE_BYTES = 1_000_000
+# Politeness: requests to one host start at least this many seconds apart, across all threads
+# (contact pages are fetched concurrently, and several companies may be analyzed at once)
+_HOST_MIN_INTERVAL = 1.0
+_host_next_request = {} # host -> earliest time.monotonic() its next request may start
+_host_next_request_lock = threading.Lock()
+
+# --- Preferred business addresses ---
+# Local parts in priority order (contact@ beats info@ ...); the rank dict lets one pass pick the best email
+_PRIORITY_LOCAL_PARTS = ('contact', 'info', 'hello', 'sales', 'support', 'team', 'hr', 'careers', 'jobs', 'inquiries')
+_PRIORITY_RANK = {local_part: rank for rank, local_part in enumerate(_PRIORITY_LOCAL_PARTS)}
+# A homepage email with one of these is good enough to skip the contact pages
+_TOP_EMAIL_PREFIXES = ('contact@', 'info@', 'hello@')
+
+# --- Email patterns (compiled once) ---
+_EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+_MAILTO_RE = re.compile(r'mailto:([^?]+)')
+# Common false positives (placeholders, CMS/tracking domains), as one alternation so rejection is a single search
+_INVALID_EMAIL_RE = re.compile('|'.join([
+    r'example\.com$', r'yourname@', r'your@email\.com$',
+    r'user@', r'name@', r'domain\.com$', r'email@example',
+    r'test@', r'@example\.', r'sample@', r'wixpress\.com$',
+    r'wordpress\.com$', r'sentry\.io$', r'localhost', r'mysite\.com$'
+]))
+# Obfuscated forms: "name [at] domain [dot] com" and "name @ domain . com"
+_OBFUSCATED_AT_RE = re.compile(r'([a-zA-Z0-9._%+-]+)\s*[\[\(\{]at[\]\)\}]\s*([a-zA-Z0-9.-]+)\s*[\[\(\{]dot[\]\)\}]\s*([a-zA-Z]{2,})')
+_OBFUSCATED_SPACED_RE = re.compile(r'([a-zA-Z0-9._%+-]+)\s*@\s*([a-zA-Z0-9.-]+)\s*\.\s*([a-zA-Z]{2,})')
+# The "[at]" marker, used as the anchor for _OBFUSCATED_AT_RE in place of '@'
+_AT_MARKER_RE = re.compile(r'[\[\(\{]at[\]\)\}]')
+# Characters searched on each side of an '@'. Valid emails are at most 64 chars (is_valid_email),
+# so anything cut off at this distance would have been rejected anyway.
+_AT_WINDOW = 128
+
+
+def _at_positions(text):
+    """Return the index of every '@' in text (str.find is a fast C scan, unlike a regex walk)."""
+    positions = []
+    i = -1
+    while (i := text.find('@', i + 1)) != -1:
+        positions.append(i)
+    return positions
+
+
+def _matches_near(pattern, text, positions):
+    """
+    Run a compiled pattern only over windows of text around the given positions.
+
+    Windows never start before the end of the previous match, so overlapping windows
+    don't report the same span twice. Besides skipping '@'-free text entirely, this keeps
+    the pattern from backtracking across long runs of word characters (minified scripts,
+    base64 blobs), which made a full-text findall quadratic.
+
+    Args:
+        pattern: Compiled regex
+        text (str): Text to search
+        positions (list): Sorted anchor indexes (see _at_positions)
+
+    Returns:
+        list: Match objects in text order
+    """
+    matches = []
+    last_end = 0
+    for i in positions:
+        if i < last_end:
+            continue  # Already inside a reported match
+        for match in pattern.finditer(text, max(i - _AT_WINDOW, last_end), i + _AT_WINDOW):
+            if match.start() > i:
+                break  # Belongs to a later '@' and may be cut short here; its own window finds it
+            matches.append(match)
+            last_end = match.end()
+    return matches
+
+
+# URL path fragments that mark a likely contact page (substring match, so "/contact-us/form" counts)
+_CONTACT_PATHS = (
+    '/contact', '/contact-us', '/about/contact', '/about-us/contact',
+    '/support', '/help', '/team', '/about/team', '/about-us/team',
+    '/company/team', '/company/contact', '/company', '/imprint'
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _extract_domain(url):
+    """Extract the domain (without www.) from a URL; cached since the same sites come up repeatedly."""
+    if not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
+        
+    domain = urlparse(url).netloc
+    # Remove www. if present
+    if domain.startswith('www.'):
+        domain = domain[4:]
+    return domain
+
+
+def _wait_for_host(url):
+    """Block until the URL's host may be requested again, reserving the next slot for this request."""
+    host = urlparse(url).netloc.lower()
+    with _host_next_request_lock:
+        now = time.monotonic()
+        start = max(now, _host_next_request.get(host, now))
+        _host_next_request[host] = start + _HOST_MIN_INTERVAL
+    if start > now:
+        time.sleep(start - now)
+
+
+def _parse_page(html):
+    """
+    Parse a page once into what the email search needs.
+
+    Uses selectolax when available and BeautifulSoup otherwise.
+
+    Returns:
+        tuple: (body text, list of (href, link text) for every anchor with an href)
+    """
+    if LexborHTMLParser is not None:
+        tree = LexborHTMLParser(html)
+        # Drop inline JS/CSS first: BeautifulSoup's get_text skips their strings, so both paths see the same text
+        for node in tree.css('script, style'): node.decompose()
+        text_content = tree.body.text(separator=' ', strip=True) if tree.body else ''
+        links = [(node.attributes.get('href') or '', node.text()) for node in tree.css('a[href]')]
+    else:
+        soup = BeautifulSoup(html, 'lxml')
+        text_content = soup.body.get_text(' ', strip=True) if soup.body else ''
+        links = [(a_tag.get('href'), a_tag.text) for a_tag in soup.find_all('a', href=True)]
+    return text_content, links
+
 class UnifiedEmailFinderTool(BaseTool):
     name: str = "Unified Company Email Finder"
     description: str = (
@@ -21,54 +167,20 @@ class UnifiedEmailFinderTool(BaseTool):
     )
     
     # Request headers
-    _headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5',
-        'Referer': 'https://www.google.com/',
-        'DNT': '1',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1',
-    }
-    
-    # Common contact page paths
-    _contact_paths = [
-        '/contact', '/contact-us', '/about/contact', '/about-us/contact',
-        '/support', '/help', '/team', '/about/team', '/about-us/team',
-        '/company/team', '/company/contact', '/company', '/imprint'
-    ]
+    _headers = _REQUEST_HEADERS
     
     def extract_domain(self, url: str) -> str:
         """Extract the domain from a URL."""
-        if not url.startswith(('http://', 'https://')):
-            url = 'https://' + url
-            
-        parsed_url = urlparse(url)
-        domain = parsed_url.netloc
-        # Remove www. if present
-        if domain.startswith('www.'):
-            domain = domain[4:]
-        return domain
+        return _extract_domain(url)
     
     def is_valid_email(self, email: str) -> bool:
         """Validate an email address format and filter out common false positives."""
-        # Email regex pattern
-        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        
-        if not re.match(email_pattern, email):
+        if not _EMAIL_RE.match(email):
             return False
             
         # Filter out common false positives
-        invalid_patterns = [
-            r'example\.com$', r'yourname@', r'your@email\.com$',
-            r'user@', r'name@', r'domain\.com$', r'email@example',
-            r'test@', r'@example\.', r'sample@', r'wixpress\.com$',
-            r'wordpress\.com$', r'sentry\.io$', r'localhost', r'mysite\.com$'
-        ]
-        
-        for pattern in invalid_patterns:
-            if re.search(pattern, email.lower()):
-                return False
+        if _INVALID_EMAIL_RE.search(email.lower()):
+            return False
         
         # Check email parts
         local_part, domain_part = email.split('@', 1)
@@ -81,45 +193,42 @@ class UnifiedEmailFinderTool(BaseTool):
         
         return True
     
-    def find_emails(self, soup, page_url=None):
-        """Extract emails from a BeautifulSoup object using multiple methods."""
+    def find_emails(self, text_content, links, page_url=None):
+        """Extract emails from a page's body text and links (see _parse_page) using multiple methods."""
         emails = set()
         
         # Method 1: Extract from mailto links
-        mailto_links = soup.select('a[href^="mailto:"]')
-        for link in mailto_links:
-            href = link.get('href', '')
-            match = re.search(r'mailto:([^?]+)', href)
+        for href, _ in links:
+            if not href.startswith('mailto:'):
+                continue
+            match = _MAILTO_RE.search(href)
             if match:
                 email = match.group(1).strip().lower()
                 if self.is_valid_email(email):
                     emails.add(email)
         
+        # Only text around an '@' can hold a plain or "name @ domain . com" email
+        at_positions = _at_positions(text_content) if text_content else []
+
         # Method 2: Extract from text content
-        if soup.body:
-            text_content = soup.body.get_text(' ', strip=True)
-            email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-            found_emails = re.findall(email_pattern, text_content)
-            for email in found_emails:
+        for match in _matches_near(_EMAIL_RE, text_content, at_positions):
+            email = match.group(0).lower()
+            if self.is_valid_email(email):
+                emails.add(email)
+        
+        # Method 3: Look for obfuscated emails, each form anchored on its own marker.
+        # The two forms stay separate patterns: as one alternation, a match of one form
+        # would consume text the other form needs (e.g. "foo @ bar. tom(at)z{dot}de").
+        if text_content:
+            marker_positions = [match.start() for match in _AT_MARKER_RE.finditer(text_content)]
+            matches = _matches_near(_OBFUSCATED_AT_RE, text_content, marker_positions)
+            matches += _matches_near(_OBFUSCATED_SPACED_RE, text_content, at_positions)
+            for match in matches:
+                local_part, domain, tld = match.groups()
+                email = f"{local_part.strip()}@{domain.strip()}.{tld.strip()}"
                 if self.is_valid_email(email.lower()):
                     emails.add(email.lower())
         
-        # Method 3: Look for obfuscated emails
-        if soup.body:
-            text_content = soup.body.get_text(' ', strip=True)
-            patterns = [
-                r'([a-zA-Z0-9._%+-]+)\s*[\[\(\{]at[\]\)\}]\s*([a-zA-Z0-9.-]+)\s*[\[\(\{]dot[\]\)\}]\s*([a-zA-Z]{2,})',
-                r'([a-zA-Z0-9._%+-]+)\s*@\s*([a-zA-Z0-9.-]+)\s*\.\s*([a-zA-Z]{2,})'
-            ]
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, text_content)
-                for match in matches:
-                    if isinstance(match, tuple) and len(match) == 3:
-                        email = f"{match[0].strip()}@{match[1].strip()}.{match[2].strip()}"
-                        if self.is_valid_email(email.lower()):
-                            emails.add(email.lower())
-        
         return list(emails)
     
     def get_best_email(self, emails):
@@ -127,32 +236,27 @@ class UnifiedEmailFinderTool(BaseTool):
         if not emails:
             return None
             
-        # Priority prefixes for business emails
-        prefixes = [
-            'contact@', 'info@', 'hello@', 'sales@', 'support@', 
-            'team@', 'hr@', 'careers@', 'jobs@', 'inquiries@'
-        ]
-        
-        # First try to find emails with priority prefixes
-        for prefix in prefixes:
-            for email in emails:
-                if email.startswith(prefix):
-                    return email
-        
-        # If no priority email found, return the first one
-        return emails[0]
+        # One pass: keep the earliest email with the best-ranked local part.
+        # If no priority email is found, the first one is returned.
+        best_email, best_rank = emails[0], len(_PRIORITY_LOCAL_PARTS)
+        for email in emails:
+            rank = _PRIORITY_RANK.get(email.partition('@')[0], best_rank)
+            if rank < best_rank:
+                best_email, best_rank = email, rank
+                if rank == 0:
+                    break
+        return best_email
     
-    def find_contact_pages(self, base_url, soup):
-        """Find contact page URLs from links on the current page."""
+    def find_contact_pages(self, base_url, links):
+        """Find contact page URLs from the (href, link text) pairs of the current page."""
         contact_urls = []
-        domain = self.extract_domain(base_url)
+        domain = _extract_domain(base_url)
         
         # Keywords that might indicate contact pages
         keywords = ['contact', 'team', 'about us', 'about', 'support', 'help']
         
-        for a_tag in soup.find_all('a', href=True):
-            href = a_tag.get('href')
-            link_text = a_tag.text.lower().strip()
+        for href, link_text in links:
+            link_text = link_text.lower().strip()
             
             # Skip empty or javascript links
             if not href or href.startswith(('javascript:', 'mailto:', 'tel:')) or href == '#':
@@ -162,13 +266,16 @@ class UnifiedEmailFinderTool(BaseTool):
             absolute_url = urljoin(base_url, href)
             parsed_url = urlparse(absolute_url)
             
-            # Only consider links to the same domain
-            if parsed_url.netloc and self.extract_domain(absolute_url) != domain:
+            # Only consider links to the same domain (compare the netloc already parsed above)
+            link_domain = parsed_url.netloc
+            if link_domain.startswith('www.'):
+                link_domain = link_domain[4:]
+            if parsed_url.netloc and link_domain != domain:
                 continue
                 
             # Check URL path and link text
             path = parsed_url.path.lower()
-            if any(contact_path in path for contact_path in self._contact_paths):
+            if any(contact_path in path for contact_path in _CONTACT_PATHS):
                 contact_urls.append(absolute_url)
                 continue
                 
@@ -179,8 +286,21 @@ class UnifiedEmailFinderTool(BaseTool):
     
     @retry(max_attempts=3, delay=2, backoff=2, exceptions=(requests.RequestException,))
     def fetch_url(self, url, headers=None):
-        """Fetch URL with retry mechanism."""
-        return requests.get(url, headers=headers or self._headers, timeout=15, allow_redirects=True)
+        """Fetch URL with retry mechanism (over the shared keep-alive session). The body is streamed; see read_capped_text."""
+        _wait_for_host(url)
+        return _SESSION.get(url, headers=headers, timeout=15, allow_redirects=True, stream=True)
+    
+    def fetch_page_emails(self, url):
+        """Fetch one contact page and return the emails found on it (empty list on failure)."""
+        try:
+            logger.debug(f"Fetching contact page: {url}")
+            with self.fetch_url(url) as response:
+                response.raise_for_status()
+                html = read_capped_text(response, _MAX_PAGE_BYTES)
+            return self.find_emails(*_parse_page(html), url)
+        except Exception as e:
+            logger.warning(f"Error fetching contact page {url}: {e}")
+            return []
     
     @handle_api_error
     def _run(self, company_url: str) -> str:
@@ -202,44 +322,34 @@ class UnifiedEmailFinderTool(BaseTool):
             # Start with the homepage
             logger.debug(f"Fetching homepage: {company_url}")
             
-            response = self.fetch_url(company_url)
-            response.raise_for_status()
+            with self.fetch_url(company_url) as response:
+                response.raise_for_status()
+                html = read_capped_text(response, _MAX_PAGE_BYTES)
             visited_urls.add(company_url)
             
-            homepage_soup = BeautifulSoup(response.text, 'lxml')
+            homepage_text, homepage_links = _parse_page(html)
             
             # Find emails on homepage
-            homepage_emails = self.find_emails(homepage_soup, company_url)
+            homepage_emails = self.find_emails(homepage_text, homepage_links, company_url)
             all_emails.extend(homepage_emails)
             
             # If we already found a good email, return it
             if homepage_emails:
                 best_email = self.get_best_email(homepage_emails)
-                if best_email and any(best_email.startswith(prefix) for prefix in ['contact@', 'info@', 'hello@']):
+                if best_email and best_email.startswith(_TOP_EMAIL_PREFIXES):
                     return best_email
             
             # Find contact pages
-            contact_pages = self.find_contact_pages(company_url, homepage_soup)
+            contact_pages = self.find_contact_pages(company_url, homepage_links)
             
-            # Visit up to 3 contact pages
-            for url in contact_pages[:3]:
-                if url in visited_urls:
-                    continue
-                    
-                try:
-                    logger.debug(f"Fetching contact page: {url}")
-                    time.sleep(random.uniform(1, 2))  # Be polite with delays
-                    
-                    response = self.fetch_url(url)
-                    response.raise_for_status()
-                    visited_urls.add(url)
-                    
-                    contact_soup = BeautifulSoup(response.text, 'lxml')
-                    contact_emails = self.find_emails(contact_soup, url)
-                    
-                    all_emails.extend(contact_emails)
-                except Exception as e:
-                    logger.warning(f"Error fetching contact page {url}: {e}")
+            # Visit up to 3 contact pages at once. fetch_url still starts requests to the site
+            # _HOST_MIN_INTERVAL apart, but their responses download in parallel.
+            pages_to_visit = [url for url in contact_pages[:_MAX_CONTACT_PAGES] if url not in visited_urls]
+            if pages_to_visit:
+                with ThreadPoolExecutor(max_workers=len(pages_to_visit)) as pool:
+                    for contact_emails in pool.map(self.fetch_page_emails, pages_to_visit):
+                        all_emails.extend(contact_emails)
+                visited_urls.update(pages_to_visit)
             
             # Return the best email found
             if all_emails:
@@ -251,5 +361,9 @@ class UnifiedEmailFinderTool(BaseTool):
             logger.error(f"Error finding email for {company_url}: {str(e)}")
             return ""
 
+# Homepage and contact pages of a company share one host, so pooled connections skip repeat TCP/TLS setup.
+# No adapter retries: fetch_url's @retry already retries failed requests.
+_SESSION = new_http_session(_REQUEST_HEADERS, retries=0)
+
 # Instantiate the tool
 unified_email_finder_tool = UnifiedEmailFinderTool()
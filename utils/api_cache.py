@@ -1,11 +1,15 @@
 # utils/api_cache.py
 """
-Simple in-memory caching system for API responses to reduce duplicate calls.
+Simple caching system for API responses to reduce duplicate calls.
+APICache lives in memory for one run; DiskCache persists results across runs.
 """
 
 import time
 import hashlib
 import json
+import sqlite3
+import threading
+from collections import OrderedDict
 from typing import Dict, Any, Callable, Optional
 from utils.logging_utils import get_logger
 
@@ -13,18 +17,23 @@ logger = get_logger(__name__)
 
 class APICache:
     """
-    Simple in-memory cache for API responses.
+    Simple in-memory cache for API responses, bounded by entry count (LRU) and TTL.
+    Safe to share between threads.
     """
-    def __init__(self, ttl_seconds: int = 3600):
+    def __init__(self, ttl_seconds: int = 3600, max_entries: int = 1024):
         """
         Initialize the cache.
         
         Args:
             ttl_seconds: Time-to-live in seconds for cache entries
+            max_entries: Maximum number of entries kept; least recently used entries are evicted first
         """
-        self.cache: Dict[str, Dict[str, Any]] = {}
+        self.cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
         self.ttl_seconds = ttl_seconds
-        logger.debug(f"Initialized API cache with TTL of {ttl_seconds} seconds")
+        self.max_entries = max_entries
+        # Lookups reorder the OrderedDict (move_to_end/popitem), so every access holds the lock
+        self._lock = threading.Lock()
+        logger.debug(f"Initialized API cache with TTL of {ttl_seconds} seconds and max {max_entries} entries")
         
     def _generate_key(self, func_name: str, args: tuple, kwargs: Dict[str, Any]) -> str:
         """
@@ -72,18 +81,20 @@ class APICache:
         Returns:
             Cached value or None if not found or expired
         """
-        if key not in self.cache:
-            return None
-            
-        entry = self.cache[key]
-        
-        # Check if expired
-        if time.time() - entry["timestamp"] > self.ttl_seconds:
-            # Remove expired entry
-            del self.cache[key]
-            logger.debug(f"Cache entry expired for key {key[:8]}...")
-            return None
+        with self._lock:
+            entry = self.cache.get(key)
+            if entry is None:
+                return None
             
+            # Check if expired
+            if time.time() - entry["timestamp"] > self.ttl_seconds:
+                # Remove expired entry
+                del self.cache[key]
+                logger.debug(f"Cache entry expired for key {key[:8]}...")
+                return None
+                
+            # Mark as most recently used
+            self.cache.move_to_end(key)
         logger.debug(f"Cache hit for key {key[:8]}...")
         return entry["value"]
         
@@ -95,15 +106,23 @@ class APICache:
             key: Cache key
             value: Value to store
         """
-        self.cache[key] = {
-            "value": value,
-            "timestamp": time.time()
-        }
+        with self._lock:
+            self.cache[key] = {
+                "value": value,
+                "timestamp": time.time()
+            }
+            self.cache.move_to_end(key)
+            
+            # Evict least recently used entries beyond the size bound
+            while len(self.cache) > self.max_entries:
+                evicted_key, _ = self.cache.popitem(last=False)
+                logger.debug(f"Evicted LRU cache entry for key {evicted_key[:8]}...")
         logger.debug(f"Cached value for key {key[:8]}...")
         
     def clear(self) -> None:
         """Clear all entries from the cache."""
-        self.cache.clear()
+        with self._lock:
+            self.cache.clear()
         logger.debug("Cache cleared")
         
     def cached(self, func: Callable) -> Callable:
@@ -132,22 +151,127 @@ class APICache:
             
         return wrapper
 
+class DiskCache:
+    """
+    Persistent cache backed by a single SQLite file, bounded by TTL.
+    Values must be JSON-serializable. Safe to share between threads.
+    """
+    def __init__(self, path: str, ttl_seconds: int = 7 * 24 * 3600):
+        """
+        Initialize the cache. The database file is only opened on first use.
+        
+        Args:
+            path: Location of the SQLite cache file
+            ttl_seconds: Time-to-live in seconds for cache entries
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        logger.debug(f"Initialized disk cache at {path} with TTL of {ttl_seconds} seconds")
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """
+        Build a fixed-length cache key from the given parts.
+        
+        Args:
+            parts: Values identifying the cached item (e.g. tool name and URL)
+            
+        Returns:
+            A hash string representing the parts
+        """
+        return hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=16).hexdigest()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database (and create the table) on first use. Caller holds the lock."""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, timestamp REAL NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a value from the cache if it exists and hasn't expired.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Cached value or None if not found, expired or the cache file is unusable
+        """
+        try:
+            with self._lock:
+                conn = self._connection()
+                row = conn.execute("SELECT value, timestamp FROM cache WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                if time.time() - row[1] > self.ttl_seconds:
+                    conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                    conn.commit()
+                    logger.debug(f"Disk cache entry expired for key {key[:8]}...")
+                    return None
+        except sqlite3.Error as e:
+            # A broken cache must never break the caller; treat it as a miss
+            logger.warning("Disk cache read failed (%s): %s", self.path, e)
+            return None
+        logger.debug(f"Disk cache hit for key {key[:8]}...")
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store a value in the cache.
+        
+        Args:
+            key: Cache key
+            value: JSON-serializable value to store
+        """
+        payload = json.dumps(value)
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, timestamp) VALUES (?, ?, ?)",
+                    (key, payload, time.time()),
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning("Disk cache write failed (%s): %s", self.path, e)
+            return
+        logger.debug(f"Disk-cached value for key {key[:8]}...")
+
+    def clear(self) -> None:
+        """Clear all entries from the cache."""
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute("DELETE FROM cache")
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning("Disk cache clear failed (%s): %s", self.path, e)
+            return
+        logger.debug("Disk cache cleared")
+
 # Create global instance
 api_cache = APICache()
 
-def cached_api_call(ttl_seconds: int = 3600):
+def cached_api_call(ttl_seconds: int = 3600, max_entries: int = 1024):
     """
     Decorator to cache API calls with a specific TTL.
     
     Args:
         ttl_seconds: Time-to-live in seconds for the cache entry
+        max_entries: Maximum number of cached results kept for the function
         
     Returns:
         Decorator function
     """
     def decorator(func: Callable) -> Callable:
         # Create a cache specific to this function
-        func_cache = APICache(ttl_seconds=ttl_seconds)
+        func_cache = APICache(ttl_seconds=ttl_seconds, max_entries=max_entries)
         
         def wrapper(*args, **kwargs):
             # Generate a unique key for this function call
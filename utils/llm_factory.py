@@ -19,13 +19,17 @@ SUPPORTED_PROVIDERS = {
     "ollama": "langchain_community", # or langchain_ollama 
 }
 
-def get_llm_instance():
+def get_llm_instance(purpose: str = "default"):
     """
     Creates and returns a LangChain LLM instance based on Config settings.
 
     Reads Config.LLM_PROVIDER and instantiates the corresponding
     LangChain chat model (e.g., ChatOpenAI, ChatAnthropic).
 
+    Args:
+        purpose: "default" for the agents' main model, or "pain_point" for the smaller,
+                 output-capped model used by the pain point analyzer (Config.PAIN_POINT_MODEL).
+
     Returns:
         An instance of a LangChain BaseLanguageModel (e.g., ChatOpenAI)
         or None if initialization fails.
@@ -34,7 +38,11 @@ def get_llm_instance():
     temperature = Config.LLM_TEMPERATURE
     llm_instance = None
 
-    logger.info(f"Attempting to initialize LLM for provider: '{provider}'")
+    # Task-specific routing: the pain point tool only needs a short numbered list
+    purpose_model = Config.PAIN_POINT_MODEL if purpose == "pain_point" else None
+    max_tokens = Config.PAIN_POINT_MAX_TOKENS if purpose == "pain_point" else None
+
+    logger.info(f"Attempting to initialize LLM for provider: '{provider}' (purpose: {purpose})")
 
     if provider not in SUPPORTED_PROVIDERS:
         logger.error(f"Unsupported LLM provider configured: '{provider}'. Supported: {list(SUPPORTED_PROVIDERS.keys())}")
@@ -54,7 +62,7 @@ def get_llm_instance():
         if provider == "openai":
             # --- OpenAI ---
             api_key = Config.OPENAI_API_KEY
-            full_model_name = Config.OPENAI_MODEL
+            full_model_name = purpose_model or Config.OPENAI_MODEL
             plain_model_name = get_plain_model_name(full_model_name)
 
             if not api_key:
@@ -72,6 +80,8 @@ def get_llm_instance():
                     "temperature": temperature,
                     "api_key": api_key
                 }
+                if max_tokens:
+                    init_kwargs["max_tokens"] = max_tokens
                 if openai_api_base: # Only add base_url if it's set
                     init_kwargs["base_url"] = openai_api_base
                     logger.info(f"Using explicit OpenAI API base URL: {openai_api_base}")
@@ -88,19 +98,20 @@ def get_llm_instance():
         elif provider == "anthropic":
             # --- Anthropic ---
             api_key = Config.ANTHROPIC_API_KEY # Assumes this exists in Config
-            full_model_name = Config.ANTHROPIC_MODEL # Assumes this exists in Config
+            full_model_name = purpose_model or Config.ANTHROPIC_MODEL # Assumes this exists in Config
             plain_model_name = get_plain_model_name(full_model_name)
             if not api_key:
                 logger.error("Anthropic API key (ANTHROPIC_API_KEY) not found in configuration.")
                 return None
             try:
                 from langchain_anthropic import ChatAnthropic
+                extra_kwargs = {"max_tokens": max_tokens} if max_tokens else {}
                 llm_instance = ChatAnthropic(
                     model=plain_model_name,
                     temperature=temperature,
                     api_key=api_key,
                     # Add any other required Anthropic parameters here
-                    # max_tokens_to_sample=1024 # Example parameter
+                    **extra_kwargs
                 )
                 logger.info(f"Initialized ChatAnthropic with model: {plain_model_name}")
             except ImportError:
@@ -110,19 +121,21 @@ def get_llm_instance():
         elif provider == "google":
             # --- Google Gemini ---
             api_key = Config.GOOGLE_API_KEY # Assumes this exists in Config
-            full_model_name = Config.GEMINI_MODEL # Assumes this exists in Config
+            full_model_name = purpose_model or Config.GEMINI_MODEL # Assumes this exists in Config
             plain_model_name = get_plain_model_name(full_model_name)
             if not api_key:
                 logger.error("Google API key (GOOGLE_API_KEY) not found in configuration.")
                 return None
             try:
                 from langchain_google_genai import ChatGoogleGenerativeAI
+                extra_kwargs = {"max_output_tokens": max_tokens} if max_tokens else {}
                 # Note: Temperature might be handled differently or have specific ranges
                 llm_instance = ChatGoogleGenerativeAI(
                     model=plain_model_name,
                     google_api_key=api_key,
                     temperature=temperature,
-                    convert_system_message_to_human=True # Often helpful for Gemini
+                    convert_system_message_to_human=True, # Often helpful for Gemini
+                    **extra_kwargs
                 )
                 logger.info(f"Initialized ChatGoogleGenerativeAI with model: {plain_model_name}")
             except ImportError:
@@ -131,7 +144,7 @@ def get_llm_instance():
 
         elif provider == "mistralai":
             api_key = Config.MISTRAL_API_KEY
-            full_model_name = Config.MISTRAL_MODEL
+            full_model_name = purpose_model or Config.MISTRAL_MODEL
             plain_model_name = get_plain_model_name(full_model_name)
 
             if not api_key: 
@@ -139,17 +152,19 @@ def get_llm_instance():
                 return None
             try:
                 from langchain_mistralai.chat_models import ChatMistralAI
+                extra_kwargs = {"max_tokens": max_tokens} if max_tokens else {}
                 llm_instance = ChatMistralAI(
                     model=plain_model_name, 
                     mistral_api_key=api_key, 
-                    temperature=temperature)
+                    temperature=temperature,
+                    **extra_kwargs)
                 logger.info(f"Initialized ChatMistralAI with model: {plain_model_name}")
             except ImportError: 
                 logger.error("Failed to import ChatMistralAI. Install 'langchain-mistralai'.")
                 return None
 
         elif provider == "ollama":
-            full_model_name = Config.OLLAMA_MODEL
+            full_model_name = purpose_model or Config.OLLAMA_MODEL
             base_url = Config.OLLAMA_BASE_URL
             plain_model_name = get_plain_model_name(full_model_name)
 
@@ -157,10 +172,12 @@ def get_llm_instance():
             logger.warning(...)
             try:
                 from langchain_community.chat_models import ChatOllama
+                extra_kwargs = {"num_predict": max_tokens} if max_tokens else {}
                 llm_instance = ChatOllama(
                     model=plain_model_name,
                     base_url = base_url,
-                    temperature= temperature
+                    temperature= temperature,
+                    **extra_kwargs
                     ) 
 
                 logger.info(f"Initialized ChatOllama with model: {plain_model_name} at {base_url}")
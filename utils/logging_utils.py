@@ -32,7 +32,7 @@ def setup_logging(log_level: str = "INFO") -> None:
     logging.getLogger('urllib3').setLevel(logging.WARNING)
     logging.getLogger('requests').setLevel(logging.WARNING)
     
-    logging.info(f"Logging initialized at {log_level} level")
+    logging.info("Logging initialized at %s level", log_level)
 
 def get_logger(name: str) -> logging.Logger:
     """
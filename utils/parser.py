@@ -10,8 +10,16 @@ import json
 from typing import List, Dict, Any, Optional, Union
 from utils.logging_utils import get_logger
 
+try:
+    import orjson # Optional: faster parsing of JSON-formatted agent output
+except ImportError:
+    orjson = None
+
 logger = get_logger(__name__)
 
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either the same way
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 def parse_url_list(agent_output: str) -> List[str]:
     """
     Extract URLs from agent output text with improved parsing.
@@ -37,7 +45,7 @@ def parse_url_list(agent_output: str) -> List[str]:
     # Method 1: Try to parse as JSON
     try:
         # Sometimes the output is actually JSON format
-        json_data = json.loads(cleaned_output)
+        json_data = _json_loads(cleaned_output)
         if isinstance(json_data, list):
             urls = [str(item).strip() for item in json_data 
                    if isinstance(item, str) and item.strip().startswith('http')]
@@ -86,6 +94,32 @@ def parse_url_list(agent_output: str) -> List[str]:
         logger.error(f"Error during regex URL extraction: {e}")
         return []
 
+def _valid_company_entries(items: list) -> List[Dict[str, str]]:
+    """
+    Keep the well-formed {'name', 'website'} dicts from a parsed list.
+    
+    Args:
+        items: Parsed list items (any type)
+        
+    Returns:
+        List of dictionaries with stripped 'name' and 'website' values
+    """
+    companies = []
+    for item in items:
+        if isinstance(item, dict):
+            name = item.get('name')
+            website = item.get('website')
+            
+            if (isinstance(name, str) and isinstance(website, str) and 
+                name.strip() and website.strip().startswith('http') and 
+                1 < len(name) < 60):
+                
+                companies.append({
+                    'name': name.strip(),
+                    'website': website.strip()
+                })
+    return companies
+
 def parse_company_data(agent_output: str) -> List[Dict[str, str]]:
     """
     Extract company data (name and website) from agent output with improved parsing.
@@ -111,21 +145,9 @@ def parse_company_data(agent_output: str) -> List[Dict[str, str]]:
     
     # Method 1: Try to parse as JSON
     try:
-        json_data = json.loads(cleaned_output)
+        json_data = _json_loads(cleaned_output)
         if isinstance(json_data, list):
-            for item in json_data:
-                if isinstance(item, dict):
-                    name = item.get('name')
-                    website = item.get('website')
-                    
-                    if (isinstance(name, str) and isinstance(website, str) and 
-                        name.strip() and website.strip().startswith('http') and 
-                        1 < len(name) < 60):
-                        
-                        companies.append({
-                            'name': name.strip(),
-                            'website': website.strip()
-                        })
+            companies = _valid_company_entries(json_data)
             
             if companies:
                 logger.info(f"Extracted {len(companies)} companies via JSON parsing")
@@ -139,19 +161,7 @@ def parse_company_data(agent_output: str) -> List[Dict[str, str]]:
     try:
         potential_list = ast.literal_eval(cleaned_output)
         if isinstance(potential_list, list):
-            for item in potential_list:
-                if isinstance(item, dict):
-                    name = item.get('name')
-                    website = item.get('website')
-                    
-                    if (isinstance(name, str) and isinstance(website, str) and 
-                        name.strip() and website.strip().startswith('http') and 
-                        1 < len(name) < 60):
-                        
-                        companies.append({
-                            'name': name.strip(),
-                            'website': website.strip()
-                        })
+            companies = _valid_company_entries(potential_list)
             
             if companies:
                 logger.info(f"Extracted {len(companies)} companies via literal evaluation")
@@ -195,6 +205,53 @@ def parse_company_data(agent_output: str) -> List[Dict[str, str]]:
     logger.warning("All parsing methods failed to extract company data")
     return []
 
+def parse_company_data_by_source(agent_output: str) -> Dict[str, List[Dict[str, str]]]:
+    """
+    Extract company data grouped by source URL from a batch extraction output.
+    
+    The expected output is a JSON (or Python literal) object mapping each source URL to a
+    list of {'name', 'website'} dicts. Anything else falls back to parse_company_data, with
+    all companies filed under the '' key (source unknown).
+    
+    Args:
+        agent_output: The text output from an agent
+        
+    Returns:
+        Dictionary of source URL -> list of company dictionaries
+    """
+    logger.debug("Parsing batch company data from agent output")
+    
+    if not isinstance(agent_output, str):
+        logger.warning("Batch company parser received non-string input: %s", type(agent_output))
+        return {}
+    
+    cleaned_output = agent_output
+    if cleaned_output.strip().upper().startswith("FINAL ANSWER:"):
+        cleaned_output = cleaned_output.split(":", 1)[1].strip()
+    cleaned_output = cleaned_output.strip().strip('```python').strip('```json').strip('```').strip()
+    
+    parsed = None
+    try:
+        parsed = _json_loads(cleaned_output)
+    except Exception:
+        try:
+            parsed = ast.literal_eval(cleaned_output)
+        except Exception as e:
+            logger.debug("Could not parse batch company data as a mapping: %s", e)
+    
+    if isinstance(parsed, dict):
+        companies_by_source = {
+            str(source).strip(): _valid_company_entries(items)
+            for source, items in parsed.items() if isinstance(items, list)
+        }
+        logger.info("Extracted %s companies from %s sources via mapping parsing",
+                    sum(map(len, companies_by_source.values())), len(companies_by_source))
+        return companies_by_source
+    
+    # Not a mapping: recover what we can without source attribution
+    companies = parse_company_data(agent_output)
+    return {'': companies} if companies else {}
+
 def parse_analysis_results(result: str) -> Dict[str, str]:
     """
     Parse analysis results to extract email and pain points with improved parsing.
@@ -214,7 +271,7 @@ def parse_analysis_results(result: str) -> Dict[str, str]:
     # Try JSON parsing first if the result looks like JSON
     if result.strip().startswith('{') and result.strip().endswith('}'):
         try:
-            data = json.loads(result)
+            data = _json_loads(result)
             if isinstance(data, dict):
                 email = data.get('email', '')
                 pain_points = data.get('pain_points', '')